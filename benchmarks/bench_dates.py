@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark of release-date resolution: dh_dates.DateResolver against
+the previous pubdate_from_text (strptime first, the relative form parsed
+in its except branch, the clock read on every call), on the release-date
+texts of one run: every chapter <li> of the fixture novel pages, once
+per mapped novel.
+
+    python benchmarks/bench_dates.py [--repeat N]
+
+Each DateResolver pass starts from a new resolver, as each run does.
+"""
+import os
+import sys
+import time
+import datetime
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from dh_dates import DateResolver
+from dh_html import make_novel_soup
+from dh_mappings import TRANSLATOR_NOVEL_MAP
+from dh_paid_feed_generator import release_date_text
+from stub_server import load_novel_pages
+
+
+# ---- the previous implementation ------------------------------------------
+def legacy_pubdate_from_text(date_str):
+    if date_str is None:
+        return datetime.datetime.now(datetime.timezone.utc)
+    try:
+        return datetime.datetime.strptime(date_str, "%B %d, %Y")\
+                .replace(tzinfo=datetime.timezone.utc)
+    except:
+        now = datetime.datetime.now(datetime.timezone.utc)
+        parts = date_str.lower().split()
+        if parts and parts[0].isdigit():
+            num = int(parts[0]); unit = parts[1]
+            if "minute" in unit: return now - datetime.timedelta(minutes=num)
+            if "hour"   in unit: return now - datetime.timedelta(hours=num)
+            if "day"    in unit: return now - datetime.timedelta(days=num)
+            if "week"   in unit: return now - datetime.timedelta(weeks=num)
+    return now
+
+
+def run_date_texts() -> list:
+    """Release-date text of every chapter <li> one run sees."""
+    texts = []
+    pages = load_novel_pages()
+    for _, html, _ in pages:
+        soup = make_novel_soup(html)
+        texts.extend(release_date_text(li) for li in soup.select("li.wp-manga-chapter"))
+    # every mapped novel serves one of the fixture pages
+    novels = sum(len(titles) for titles in TRANSLATOR_NOVEL_MAP.values())
+    return texts * (novels // max(1, len(pages)))
+
+def timed(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    texts = run_date_texts()
+
+    # same answers before timing anything; relative dates may differ by
+    # the time that passed between the legacy calls
+    resolver = DateResolver()
+    for text in texts:
+        drift = abs(legacy_pubdate_from_text(text) - resolver.resolve(text))
+        assert drift < datetime.timedelta(seconds=5), text
+
+    def legacy():
+        for text in texts:
+            legacy_pubdate_from_text(text)
+    def new():
+        resolve = DateResolver().resolve
+        for text in texts:
+            resolve(text)
+
+    base = timed(legacy, args.repeat)
+    print(f"{len(texts):,} release dates per run, {len(set(texts))} distinct")
+    for name, secs in (("pubdate_from_text (before)", base),
+                       ("DateResolver", timed(new, args.repeat))):
+        print(f"  {name:<27} {secs * 1e3:8.2f} ms   {secs / len(texts) * 1e6:6.2f} µs/date   ×{base / secs:5.1f}")
+
+if __name__ == "__main__":
+    main()
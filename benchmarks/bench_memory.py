@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Memory per feed item on a large synthetic feed, measured with tracemalloc:
+the Chapter record the pipelines use now, against the chapter dict plus
+PyRSS2Gen item (with its Guid) that they used to build for every chapter.
+The field strings are created before tracing starts, so the numbers are
+the per-item container overhead, which is what the model choice changes.
+
+    python benchmarks/bench_memory.py [--items N]
+
+The legacy model is only measured when PyRSS2Gen is installed.
+"""
+import gc
+import os
+import sys
+import datetime
+import argparse
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from dh_mappings import get_novel_meta
+from dh_rss import Chapter
+
+try:
+    import PyRSS2Gen
+except ImportError:
+    PyRSS2Gen = None
+
+
+def synthetic_fields(n: int) -> list:
+    """n distinct field tuples shaped like real paid chapters."""
+    base = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+    titles = ["Clap", "Fever Break", "Red Dot", "Zion's Garden"]
+    return [(
+        titles[i % len(titles)],
+        f"{i % 7 + 1} - Volume Title {i % 7}",
+        f"Chapter {i}",
+        f"Name Extension {i}",
+        f"https://dragonholic.com/novel/fixture/chapter-{i}/",
+        "<p>Shared synopsis of the novel.</p>",
+        base + datetime.timedelta(hours=i),
+        str(900000 + i),
+        str(i % 5 + 1),
+    ) for i in range(n)]
+
+def build_chapters(fields):
+    return [Chapter(title, volume, chaptername, nameextend, link, desc, pub, guid, coin,
+                    get_novel_meta(title))
+            for title, volume, chaptername, nameextend, link, desc, pub, guid, coin in fields]
+
+if PyRSS2Gen is not None:
+    class _LegacyItem(PyRSS2Gen.RSSItem):
+        # the shape of the old MyRSSItem
+        def __init__(self, *args, volume="", chaptername="", nameextend="", coin="", **kwargs):
+            self.volume      = volume
+            self.chaptername = chaptername
+            self.nameextend  = nameextend
+            self.coin        = coin
+            super().__init__(*args, **kwargs)
+
+def build_legacy(fields):
+    """The old path: a dict per scraped chapter, copied into a PyRSS2Gen item."""
+    dicts, items = [], []
+    for title, volume, chaptername, nameextend, link, desc, pub, guid, coin in fields:
+        chap = {"volume": volume, "chaptername": chaptername, "nameextend": nameextend,
+                "link": link, "pubDate": pub, "guid": guid, "coin": coin, "description": desc}
+        dicts.append(chap)
+        items.append(_LegacyItem(
+            title=title, volume=chap["volume"], chaptername=chap["chaptername"],
+            nameextend=chap["nameextend"], link=chap["link"], description=chap["description"],
+            guid=PyRSS2Gen.Guid(chap["guid"], isPermaLink=False), pubDate=chap["pubDate"],
+            coin=chap["coin"]))
+    return dicts, items
+
+def measure(build, fields) -> tuple:
+    """(retained bytes, peak bytes) allocated by build(fields)."""
+    gc.collect()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = tracemalloc.get_traced_memory()[0]
+    result = build(fields)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current - start, peak - start
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--items", type=int, default=50_000)
+    args = ap.parse_args()
+
+    fields = synthetic_fields(args.items)
+    for title in {f[0] for f in fields}:
+        get_novel_meta(title)  # warm the memo outside the measurement
+
+    models = [("Chapter (NamedTuple)", build_chapters)]
+    if PyRSS2Gen is not None:
+        models.insert(0, ("dict + PyRSS2Gen item", build_legacy))
+
+    print(f"{args.items:,} items")
+    for name, build in models:
+        retained, peak = measure(build, fields)
+        print(f"  {name:<24} {retained / args.items:7.0f} B/item retained   "
+              f"{peak / args.items:7.0f} B/item peak   ({retained / 2**20:6.1f} MiB)")
+
+if __name__ == "__main__":
+    main()
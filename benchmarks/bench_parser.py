@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Per-page cost of parse_paid_chapters on the saved novel pages in
+benchmarks/fixtures/, for every available parser backend, with and without
+the targeted region slicing. Speedups are relative to the old behaviour
+(whole page through html.parser).
+
+    python benchmarks/bench_parser.py [--repeat N]
+"""
+import gc
+import os
+import sys
+import glob
+import time
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import dh_html
+import dh_paid_feed_generator as paid
+
+FIXTURES = os.path.join(ROOT, "benchmarks", "fixtures")
+BASE_URL = "https://dragonholic.com/novel/fixture/"
+
+
+def time_parse(html: str, parser: str, targeted: bool, repeat: int) -> float:
+    """Best-of-repeat seconds for one parse_paid_chapters call (GC paused)."""
+    make = paid.make_novel_soup
+    paid.make_novel_soup = lambda h: dh_html.make_novel_soup(h, parser, targeted)
+    gc.collect()
+    gc.disable()
+    try:
+        best = float("inf")
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            paid.parse_paid_chapters(html, BASE_URL)
+            best = min(best, time.perf_counter() - t0)
+        return best
+    finally:
+        gc.enable()
+        paid.make_novel_soup = make
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--repeat", type=int, default=10)
+    args = ap.parse_args()
+
+    backends = [("html.parser", False), ("html.parser", True)]
+    if dh_html.HAVE_LXML:
+        backends += [("lxml", False), ("lxml", True)]
+
+    for path in sorted(glob.glob(os.path.join(FIXTURES, "novel_*.html"))):
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        print(f"{os.path.basename(path)}  ({len(html) / 1024:.0f} KiB)")
+        baseline = None
+        for parser, targeted in backends:
+            secs = time_parse(html, parser, targeted, args.repeat)
+            baseline = baseline or secs
+            label = f"{parser}{' + targeted' if targeted else ''}"
+            print(f"  {label:<24} {secs * 1000:8.2f} ms/page   ×{baseline / secs:5.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for both feed pipelines. Every novel page and the
+free-chapters feed are served from the recorded fixtures by a local stub
+server (benchmarks/stub_server.py), so results depend only on this
+machine and this commit. The request rate limit is disabled so the
+timings measure our own code rather than the politeness delay.
+
+    python benchmarks/bench_suite.py [--repeat N] [--output results.json]
+                                     [--compare baseline.json]
+
+Each result is seconds per operation (best and median of N runs). Save the
+JSON from one commit and pass it as --compare on another to see the change.
+"""
+import gc
+import io
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+import contextlib
+from operator import attrgetter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import feedparser
+
+import dh_feed_generator as free
+import dh_paid_feed_generator as paid
+from dh_http import FetchScheduler, ValidatorCache
+import dh_mappings
+from dh_mappings import get_novel_meta
+from dh_store import ChapterStore
+from dh_order import newest_first
+from dh_rss import write_chapter, write_feed
+from dh_xml_writer import PrettyXMLWriter
+from stub_server import StubServer, pointed_at, load_free_feed
+
+TITLES = [t for novels in paid.TRANSLATOR_NOVEL_MAP.values() for t in novels]
+
+
+def _summary(times: list, ops: int) -> dict:
+    per_op = [t / ops for t in times]
+    return {"best": min(per_op), "median": statistics.median(per_op), "runs": len(times), "ops": ops}
+
+def bench(func, repeat: int, ops: int = 1) -> dict:
+    """Time func() (which performs `ops` operations) with GC paused."""
+    times = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - t0)
+    finally:
+        gc.enable()
+    return _summary(times, ops)
+
+async def abench(factory, repeat: int, ops: int = 1, setup=None) -> dict:
+    """Like bench() for a coroutine; setup() runs untimed before each run."""
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        gc.collect()
+        t0 = time.perf_counter()
+        await factory()
+        times.append(time.perf_counter() - t0)
+    return _summary(times, ops)
+
+def _unthrottled() -> FetchScheduler:
+    return FetchScheduler(rate=0)
+
+
+async def run_suite(repeat: int) -> dict:
+    results = {}
+    entries = feedparser.parse(load_free_feed()).entries
+    feed_titles = [e.title for e in entries]
+    feed_links = [e.link for e in entries]
+
+    # ---- text helpers ----------------------------------------------------
+    results["free.split_title"] = bench(
+        lambda: [free.split_title(t) for t in feed_titles], repeat * 10, len(feed_titles))
+    results["free.format_volume_from_url"] = bench(
+        lambda: [free.format_volume_from_url(u) for u in feed_links], repeat * 10, len(feed_links))
+
+    # ---- mappings --------------------------------------------------------
+    with tempfile.TemporaryDirectory() as tmp:
+        sidecar = os.path.join(tmp, "mappings.cache")
+        dh_mappings.load_mappings(cache_path=sidecar)
+        results["mappings.load[json]"] = bench(
+            lambda: dh_mappings.load_mappings(cache_path=""), repeat)
+        results["mappings.load[sidecar]"] = bench(
+            lambda: dh_mappings.load_mappings(cache_path=sidecar), repeat)
+
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        os.chdir(tmp)   # the generators write their XML into the working directory
+        try:
+            await _run_pipelines(results, tmp, repeat)
+        finally:
+            os.chdir(ROOT)
+    return results
+
+async def _run_pipelines(results: dict, tmp: str, repeat: int):
+    async with StubServer() as stub, _unthrottled() as fetcher:
+        with pointed_at(stub):
+            urls = [paid.get_novel_url(t) for t in TITLES]
+
+            # ---- fetch + parse -------------------------------------------
+            async def scrape_all(cache=None):
+                return await asyncio.gather(*[
+                    paid.scrape_paid_chapters_async(fetcher, url, cache) for url in urls])
+
+            results["paid.scrape_paid_chapters_async"] = await abench(
+                scrape_all, repeat, len(urls))
+            warm = ValidatorCache(os.path.join(tmp, "warm.json"))
+            await scrape_all(warm)
+            results["paid.scrape_paid_chapters_async[304]"] = await abench(
+                lambda: scrape_all(warm), repeat, len(urls))
+
+            # ---- store query ---------------------------------------------
+            store = ChapterStore(os.path.join(tmp, "bench.sqlite3"))
+            for title in TITLES:
+                await paid.process_novel(fetcher, title, warm, store)
+            cutoff = paid.paid_cutoff()
+            results["paid.store.feed_chapters"] = bench(
+                lambda: store.feed_chapters(TITLES, since=cutoff), repeat * 10)
+            items = [paid._feed_item(c, get_novel_meta(c.title))
+                     for c in store.feed_chapters(TITLES, since=cutoff)]
+            store.close()
+
+            # ---- ordering ------------------------------------------------
+            results["paid.order[full sort]"] = bench(
+                lambda: sorted(items, key=paid._feed_order, reverse=True), repeat * 10, len(items))
+            results["paid.order[newest_first, uncapped]"] = bench(
+                lambda: newest_first(items, attrgetter("title"), paid._feed_order, limit=0),
+                repeat * 10, len(items))
+            results["paid.order[merge, 100 items]"] = bench(
+                lambda: newest_first(items, attrgetter("title"), paid._feed_order, limit=100),
+                repeat * 10, len(items))
+            items = newest_first(items, attrgetter("title"), paid._feed_order, limit=0)
+
+            # ---- serialize -----------------------------------------------
+
+            def write_items():
+                xw = PrettyXMLWriter(io.StringIO())
+                for item in items:
+                    write_chapter(xw, item)
+            results["rss.write_chapter"] = bench(write_items, repeat, len(items))
+
+            results["rss.write_feed[paid]"] = bench(
+                lambda: write_feed(PrettyXMLWriter(io.StringIO()), "Dragonholic Paid Chapters",
+                                   "https://dragonholic.com", "bench", None, items), repeat)
+
+            # ---- end to end ----------------------------------------------
+            cache_path = os.path.join(tmp, "e2e.json")
+            def cold():
+                if os.path.exists(cache_path):
+                    os.unlink(cache_path)
+
+            results["e2e.free[cold]"] = await abench(
+                lambda: free.main_async(fetcher, ValidatorCache(cache_path)), repeat, setup=cold)
+            e2e_cache = ValidatorCache(cache_path)
+            await free.main_async(fetcher, e2e_cache)
+            results["e2e.free[304]"] = await abench(
+                lambda: free.main_async(fetcher, e2e_cache), repeat)
+
+            results["e2e.paid[cold]"] = await abench(
+                lambda: paid.main_async(False, fetcher, ValidatorCache(cache_path)), repeat, setup=cold)
+            e2e_cache = ValidatorCache(cache_path)
+            await paid.main_async(True, fetcher, e2e_cache)
+            results["e2e.paid[304]"] = await abench(
+                lambda: paid.main_async(False, fetcher, e2e_cache), repeat)
+            results["e2e.paid[304, incremental]"] = await abench(
+                lambda: paid.main_async(True, fetcher, e2e_cache), repeat)
+
+    # ---- pages whose ETag changes on every request -----------------------
+    async with StubServer(rotate_nonces=True) as stub, _unthrottled() as fetcher:
+        with pointed_at(stub):
+            urls = [paid.get_novel_url(t) for t in TITLES]
+            async def scrape_all(cache):
+                return await asyncio.gather(*[
+                    paid.scrape_paid_chapters_async(fetcher, url, cache) for url in urls])
+            hashed = ValidatorCache(os.path.join(tmp, "hashed.json"))
+            await scrape_all(hashed)
+            results["paid.scrape_paid_chapters_async[unchanged]"] = await abench(
+                lambda: scrape_all(hashed), repeat, len(urls))
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+def _fmt(secs: float) -> str:
+    if secs >= 1:
+        return f"{secs:8.3f} s "
+    if secs >= 1e-3:
+        return f"{secs * 1e3:8.3f} ms"
+    return f"{secs * 1e6:8.3f} µs"
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--output", help="write the results as JSON to this file")
+    ap.add_argument("--compare", help="JSON results from another commit to compare against")
+    args = ap.parse_args()
+
+    report = {
+        "commit":  _git_commit(),
+        "time":    time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python":  platform.python_version(),
+        "machine": platform.machine(),
+        "results": asyncio.run(run_suite(args.repeat)),
+    }
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f).get("results", {})
+
+    for name, r in report["results"].items():
+        line = f"{name:<40} {_fmt(r['best'])}/op   (median {_fmt(r['median']).strip()}, ×{r['ops']})"
+        if name in baseline:
+            line += f"   {r['best'] / baseline[name]['best'] - 1:+7.1%} vs baseline"
+        print(line)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"📝 Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
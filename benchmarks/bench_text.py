@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark of the text helpers in dh_text against the inline versions
+the generators used before (patterns compiled on every call through the
+re module's cache, no memoisation), on the inputs of one real run: every
+title slug, every chapter name and link text on the fixture novel pages,
+and every link of the fixture free feed.
+
+    python benchmarks/bench_text.py [--repeat N]
+
+"cold" clears the LRU caches before each pass (a cron run's first
+encounter with an input); "warm" keeps them (the daemon, and the
+repeated titles and volume labels within one run).
+"""
+import os
+import re
+import sys
+import time
+import argparse
+from urllib.parse import urlparse, unquote
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import feedparser
+
+import dh_text
+from dh_html import make_novel_soup
+from dh_mappings import TRANSLATOR_NOVEL_MAP
+from stub_server import load_novel_pages, load_free_feed
+
+
+# ---- the previous inline implementations --------------------------------
+def legacy_slug(text):
+    s = text.lower().strip()
+    s = re.sub(r"[^\w\s\u0080-\uFFFF-]", "", s)
+    s = re.sub(r"[\s_]+", "-", s)
+    s = re.sub(r"-{2,}", "-", s)
+    return s
+
+def legacy_chapter_num(chaptername):
+    nums = re.findall(r'\d+(?:\.\d+)?', chaptername)
+    return tuple(float(n) if '.' in n else int(n) for n in nums) if nums else (0,)
+
+def legacy_split_chapter_link(raw_html):
+    m1 = re.match(r'\s*([^<]+)', raw_html)
+    chap_name = m1.group(1).strip() if m1 else raw_html.strip()
+    m2 = re.search(r'</i>\s*[-–]\s*(.+)', raw_html)
+    nameext = m2.group(1).strip() if m2 else ""
+    num_m = re.search(r"(\d+(?:\.\d+)?)", chap_name)
+    return chap_name, nameext, num_m.group(1) if num_m else ""
+
+def legacy_smart_title(parts):
+    small = {"a","an","the","and","but","or","nor","for","so","yet",
+             "at","by","in","of","on","to","up","via"}
+    out = []
+    last = len(parts) - 1
+    for i, w in enumerate(parts):
+        wl = w.lower()
+        if i == 0 or i == last or wl not in small:
+            out.append(w.capitalize())
+        else:
+            out.append(wl)
+    return " ".join(out)
+
+def legacy_format_volume_from_url(url):
+    segs = [s for s in urlparse(url).path.split("/") if s]
+    if len(segs) >= 4 and segs[0] == "novel":
+        raw   = unquote(segs[2]).replace("_","-").strip("-")
+        parts = raw.split("-")
+        if not parts:
+            return ""
+        colon_keywords = {"volume","chapter","vol","chap","arc","world","plane","story","v"}
+        lead = parts[0].lower()
+        if lead in colon_keywords and len(parts) >= 2 and parts[1].isdigit():
+            num  = parts[1]
+            rest = parts[2:]
+            if lead == "v":
+                return f"V{num}: {legacy_smart_title(rest)}" if rest else f"V{num}"
+            label = lead.capitalize()
+            return f"{label} {num}: {legacy_smart_title(rest)}" if rest else f"{label} {num}"
+        return legacy_smart_title(parts)
+    return ""
+
+
+def new_split_chapter_link(raw_html):
+    chap_name, nameext = dh_text.split_chapter_link(raw_html)
+    return chap_name, nameext, dh_text.first_number(chap_name)
+
+
+def run_inputs():
+    """(titles, link texts, chapter names + volume labels, free feed links) of one run."""
+    titles = [t for novels in TRANSLATOR_NOVEL_MAP.values() for t in novels]
+    link_htmls, names = [], []
+    for _, html, _ in load_novel_pages():
+        soup = make_novel_soup(html)
+        for vol in soup.select("li.parent.has-child a.has-child"):
+            names.append(vol.get_text(strip=True))
+        for a in soup.select("li.wp-manga-chapter a"):
+            link_htmls.append(a.decode_contents())
+    # every mapped novel serves one of the fixture pages
+    per_title = len(titles) // max(1, len(load_novel_pages()))
+    link_htmls *= per_title
+    names = names * per_title + [legacy_split_chapter_link(h)[0] for h in link_htmls]
+    feed_links = [e.link for e in feedparser.parse(load_free_feed()).entries]
+    return titles, link_htmls, names, feed_links
+
+def one_pass(slug, chapter_num, split_link, volume, inputs):
+    titles, link_htmls, names, feed_links = inputs
+    for t in titles:
+        slug(t)
+    for h in link_htmls:
+        split_link(h)
+    for n in names:
+        slug(n)
+        chapter_num(n)
+    for u in feed_links:
+        volume(u)
+
+def timed(func, repeat: int, before=None) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        if before:
+            before()
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def clear_caches():
+    dh_text.slug.cache_clear()
+    dh_text.format_volume_from_url.cache_clear()
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    inputs = run_inputs()
+    ops = len(inputs[0]) + len(inputs[1]) + 2 * len(inputs[2]) + len(inputs[3])
+
+    legacy = lambda: one_pass(legacy_slug, legacy_chapter_num, legacy_split_chapter_link,
+                              legacy_format_volume_from_url, inputs)
+    new = lambda: one_pass(dh_text.slug, dh_text.chapter_num, new_split_chapter_link,
+                           dh_text.format_volume_from_url, inputs)
+
+    # same answers before timing anything
+    titles, link_htmls, names, feed_links = inputs
+    assert [legacy_slug(x) for x in titles + names] == [dh_text.slug(x) for x in titles + names]
+    assert [legacy_chapter_num(x) for x in names] == [dh_text.chapter_num(x) for x in names]
+    assert [legacy_split_chapter_link(h) for h in link_htmls] == [new_split_chapter_link(h) for h in link_htmls]
+    assert ([legacy_format_volume_from_url(u) for u in feed_links]
+            == [dh_text.format_volume_from_url(u) for u in feed_links])
+
+    base = timed(legacy, args.repeat)
+    print(f"{ops:,} helper calls per run")
+    for name, secs in (("inline (before)", base),
+                       ("dh_text, cold", timed(new, args.repeat, before=clear_caches)),
+                       ("dh_text, warm", timed(new, args.repeat))):
+        print(f"  {name:<16} {secs * 1e3:8.2f} ms   {secs / ops * 1e6:6.2f} µs/call   ×{base / secs:4.2f}")
+
+if __name__ == "__main__":
+    main()
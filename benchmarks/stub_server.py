@@ -0,0 +1,131 @@
+# stub_server.py
+#
+# Local HTTP server that replays the recorded pages in benchmarks/fixtures/,
+# so the pipelines can be timed end to end without touching the network.
+#
+#   /novel/<slug>/           a recorded novel page (layout picked per slug),
+#                            with its chapter links rewritten to <slug>
+#   /feed/free-chapters      the recorded free-chapters RSS payload
+#
+# Every response carries a strong ETag and honours If-None-Match, so warm
+# runs see the same 304s they would against the real site.
+
+import os
+import re
+import glob
+import zlib
+import hashlib
+from collections import Counter
+from contextlib import contextmanager
+
+from aiohttp import web
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+FREE_FEED_PATH = "/feed/free-chapters"
+
+_FIXTURE_SLUG = re.compile(r'summary_image"><a href="https://dragonholic\.com/novel/([^/"]+)/')
+_FIXTURE_NONCE = re.compile(r'("nonce":")[0-9a-f]+')
+
+
+def load_novel_pages() -> list:
+    """(file name, html, slug the page was recorded under) for every recorded novel page."""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES, "novel_*.html"))):
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        m = _FIXTURE_SLUG.search(html)
+        pages.append((os.path.basename(path), html, m.group(1) if m else ""))
+    return pages
+
+def load_free_feed() -> bytes:
+    with open(os.path.join(FIXTURES, "free_chapters.xml"), "rb") as f:
+        return f.read()
+
+
+class StubServer:
+    """
+    aiohttp server on 127.0.0.1 (random free port unless given). With
+    rotate_nonces, every novel page response carries a fresh script nonce,
+    so its ETag never matches, like the live site between real changes.
+
+        async with StubServer() as stub:
+            url = stub.novel_url("some-novel")
+            print(stub.requests, stub.hits["/novel/some-novel/"])
+    """
+
+    def __init__(self, port: int = 0, rotate_nonces: bool = False):
+        self.port = port
+        self.rotate_nonces = rotate_nonces
+        self.pages = load_novel_pages()
+        self.free_feed = load_free_feed()
+        self.requests = 0
+        self.hits = Counter()     # requests per path
+        self.not_modified = 0
+        self._runner = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def layout_of(self, slug: str) -> str:
+        """File name of the recorded page served for slug."""
+        return self.pages[zlib.crc32(slug.encode()) % len(self.pages)][0]
+
+    def novel_url(self, slug: str) -> str:
+        return f"{self.base_url}/novel/{slug}/"
+
+    @property
+    def free_feed_url(self) -> str:
+        return self.base_url + FREE_FEED_PATH
+
+    def _respond(self, request, body: bytes, content_type: str):
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        if request.headers.get("If-None-Match") == etag:
+            self.not_modified += 1
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(body=body, content_type=content_type, charset="utf-8",
+                            headers={"ETag": etag})
+
+    async def _novel(self, request):
+        self.requests += 1
+        self.hits[request.path] += 1
+        slug = request.match_info["slug"]
+        _, html, recorded = self.pages[zlib.crc32(slug.encode()) % len(self.pages)]
+        if recorded:
+            html = html.replace(f"/novel/{recorded}/", f"/novel/{slug}/")
+        if self.rotate_nonces:
+            html = _FIXTURE_NONCE.sub(r"\g<1>%010x" % self.requests, html)
+        return self._respond(request, html.encode("utf-8"), "text/html")
+
+    async def _feed(self, request):
+        self.requests += 1
+        self.hits[request.path] += 1
+        return self._respond(request, self.free_feed, "application/rss+xml")
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_get("/novel/{slug}/", self._novel)
+        app.router.add_get(FREE_FEED_PATH, self._feed)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._runner.cleanup()
+
+
+@contextmanager
+def pointed_at(stub: StubServer):
+    """Point both generators at the stub instead of the live sites for the duration."""
+    import dh_feed_generator as free
+    import dh_paid_feed_generator as paid
+    saved = free.FEED_URL, paid.get_novel_url
+    free.FEED_URL = stub.free_feed_url
+    paid.get_novel_url = lambda title: stub.novel_url(paid.slug(title))
+    try:
+        yield
+    finally:
+        free.FEED_URL, paid.get_novel_url = saved
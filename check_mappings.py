@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Validates dh_mappings.json (or the file given) against the mappings
+schema: every error and warning is listed, and the exit status is 1 when
+the generators would refuse to load it.
+"""
+import os
+import sys
+import argparse
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Validate the novel/translator mappings file.")
+    parser.add_argument("path", nargs="?", default=None,
+                        help="mappings file to check (default: dh_mappings.json)")
+    args = parser.parse_args(argv)
+    if args.path:
+        os.environ["DH_MAPPINGS"] = args.path
+    # always parse and validate the file itself, never trust or touch the sidecar
+    os.environ["DH_MAPPINGS_CACHE"] = ""
+    try:
+        import dh_mappings
+    except ValueError as e:   # MappingsError: one problem per line
+        for problem in str(e).splitlines():
+            print(f"❌ {problem}")
+        return 1
+
+    with open(dh_mappings.MAPPINGS_PATH, "rb") as f:
+        _, warnings = dh_mappings.parse_mappings(f.read())
+    for problem in warnings:
+        print(f"⚠️  {problem}")
+    novels = len(dh_mappings._NOVEL_URLS)
+    print(f"✅ {dh_mappings.MAPPINGS_PATH}: {len(dh_mappings.TRANSLATOR_NOVEL_MAP)} translators, "
+          f"{novels} novels, {len(dh_mappings.NSFW_NOVELS)} NSFW, "
+          f"{len(dh_mappings.FEATURED_IMAGE_MAP)} images, "
+          f"{len(dh_mappings.NOVEL_URL_OVERRIDES)} URL overrides")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,59 +1,119 @@
 #!/usr/bin/env python3
-import re
+"""
+Audits every mapped novel's page for paid chapters, whatever their date:
+all pages are fetched concurrently through the shared FetchScheduler and
+parsed with the paid generator's own parser, the results are recorded in
+the chapter store, and a summary table is printed at the end.
+"""
 import asyncio
-import aiohttp
+import argparse
 from datetime import datetime, timezone
-from bs4 import BeautifulSoup
-
-# import your mappings & utils
-from dh_mappings import TRANSLATOR_NOVEL_MAP, NOVEL_URL_OVERRIDES
-from dh_paid_feed_generator import slugify_title, extract_pubdate_from_soup
-
-async def fetch_page(session, url):
-    async with session.get(url) as r:
-        return await r.text() if r.status == 200 else ""
-
-async def scrape_all_paid(session, base_url):
-    """Grab _all_ paid <li> entries, regardless of date."""
-    html = await fetch_page(session, base_url)
-    if not html:
-        return []
-    soup = BeautifulSoup(html, "html.parser")
-    paid = []
-
-    def collect(chap_li, vol_label=""):
-        pub_dt = extract_pubdate_from_soup(chap_li)
-        a = chap_li.find("a")
-        title = a.get_text(" ", strip=True)
-        paid.append((title, pub_dt))
-
-    # volume‐based
-    for vol in soup.select("ul.main.version-chap.volumns li.parent.has-child"):
-        vol_label = vol.select_one("a.has-child").get_text(strip=True)
-        for chap_li in vol.select("ul.sub-chap-list li.wp-manga-chapter"):
-            if "free-chap" not in chap_li.get("class", []):
-                collect(chap_li, vol_label)
-
-    # no‐volume
-    for chap_li in soup.select("ul.main.version-chap.no-volumn li.wp-manga-chapter"):
-        if "free-chap" not in chap_li.get("class", []):
-            collect(chap_li)
-
-    return paid
-
-async def check_all():
-    async with aiohttp.ClientSession() as session:
-        for translator, novels in TRANSLATOR_NOVEL_MAP.items():
-            for novel in novels:
-                # build URL override → slug
-                url = NOVEL_URL_OVERRIDES.get(novel) or slugify_title(novel)
-                chaps = await scrape_all_paid(session, url)
-                if not chaps:
-                    print(f"❌  {novel!r}: page found but no paid‑chapters at all")
-                else:
-                    dates = [dt for _, dt in chaps]
-                    latest = max(dates).astimezone(timezone.utc).strftime("%Y‑%m‑%d")
-                    print(f"✅  {novel!r}: {len(chaps)} total paid chapters, latest on {latest}")
+
+from dh_mappings import TRANSLATOR_NOVEL_MAP
+from dh_paid_feed_generator import get_novel_url, parse_paid_chapters
+from dh_http import FetchScheduler, FETCH_CONCURRENCY, FETCH_RATE
+from dh_html import ParsePool
+from dh_metrics import metrics
+from dh_store import ChapterStore
+from dh_feed_reader import item_key
+
+# no date filter: every paid chapter on the page counts
+ALL_DATES = datetime.min.replace(tzinfo=timezone.utc)
+# longer novel titles are cut in the summary table
+TITLE_WIDTH = 60
+
+
+async def check_novel(fetcher, pool, store, translator: str, novel: str,
+                      now: datetime = None) -> dict:
+    """
+    Fetch, parse and store one novel; returns its row of the summary table.
+    Relative release dates are anchored to now, the audit's clock.
+    """
+    row = {"translator": translator, "novel": novel, "status": "ok",
+           "paid": 0, "latest": "", "new": 0}
+    try:
+        url = get_novel_url(novel)
+        resp = await fetcher.fetch(url)
+        if not resp.text:
+            row["status"] = f"HTTP {resp.status}" if resp.status else "failed"
+            metrics.incr("check.novels_failed")
+            return row
+        with metrics.stage("check.parse"):
+            chaps, description = await pool.run(parse_paid_chapters, resp.text, url, ALL_DATES, now)
+    except Exception as e:
+        print(f"❌ Error checking {novel!r}: {e}")
+        row["status"] = "error"
+        metrics.incr("check.novels_errored")
+        return row
+
+    metrics.incr("check.novels_checked")
+    if not chaps:
+        row["status"] = "no paid"
+        metrics.incr("check.novels_without_paid")
+        return row
+    metrics.incr("check.paid_chapters", len(chaps))
+    with metrics.stage("check.store"):
+        row["new"] = len({item_key(c.guid, c.link) for c in chaps} - store.known_keys(novel))
+        store.record_scrape(novel, chaps, description)
+    row["paid"] = len(chaps)
+    row["latest"] = max(c.pubDate for c in chaps).astimezone(timezone.utc).strftime("%Y-%m-%d")
+    return row
+
+def _cut(text: str, width: int) -> str:
+    return text if len(text) <= width else text[:width - 1] + "…"
+
+def print_summary(rows):
+    rows = [dict(r, novel=_cut(r["novel"], TITLE_WIDTH)) for r in rows]
+    headers = {"translator": "Translator", "novel": "Novel", "status": "Status",
+               "paid": "Paid", "latest": "Latest", "new": "New"}
+    widths = {k: max([len(h), *(len(str(r[k])) for r in rows)]) for k, h in headers.items()}
+    numeric = {"paid", "new"}
+    def line(values):
+        return "  ".join(str(values[k]).rjust(widths[k]) if k in numeric else str(values[k]).ljust(widths[k])
+                         for k in headers)
+    print(line(headers))
+    print("  ".join("-" * widths[k] for k in headers))
+    for row in rows:
+        print(line(row))
+    ok = sum(r["status"] == "ok" for r in rows)
+    print(f"\n✅ {ok}/{len(rows)} novels with paid chapters, "
+          f"{sum(r['paid'] for r in rows)} paid chapters, "
+          f"{sum(r['new'] for r in rows)} not in the store yet")
+    failed = [r["novel"] for r in rows if r["status"] not in ("ok", "no paid")]
+    if failed:
+        print(f"⚠️  {len(failed)} novel page(s) could not be checked: {', '.join(failed)}")
+
+async def check_all(concurrency: int = FETCH_CONCURRENCY, rate: float = FETCH_RATE) -> list:
+    """
+    Check every mapped novel, at most `concurrency` pages in flight and at
+    most `rate` requests per second. Returns the summary rows.
+    """
+    clock = datetime.now(timezone.utc)
+    novels = [(translator, novel)
+              for translator, titles in TRANSLATOR_NOVEL_MAP.items() for novel in titles]
+    pool = ParsePool()
+    try:
+        with ChapterStore() as store:
+            async with FetchScheduler(concurrency=concurrency, rate=rate) as fetcher:
+                rows = await asyncio.gather(*(check_novel(fetcher, pool, store, translator, novel, clock)
+                                              for translator, novel in novels))
+            fetcher.print_latency_summary()
+    finally:
+        pool.shutdown()
+    print_summary(rows)
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Audit every mapped novel for paid chapters.")
+    parser.add_argument("--concurrency", type=int, default=FETCH_CONCURRENCY,
+                        help=f"novel pages fetched at once (default: {FETCH_CONCURRENCY})")
+    parser.add_argument("--rate", type=float, default=FETCH_RATE,
+                        help=f"requests per second, 0 = unlimited (default: {FETCH_RATE:g})")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(check_all(args.concurrency, args.rate))
+    finally:
+        metrics.write_outputs()
 
 if __name__ == "__main__":
-    asyncio.run(check_all())
+    main()
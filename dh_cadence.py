@@ -0,0 +1,119 @@
+# dh_cadence.py
+#
+# Learns how often each novel releases paid chapters and decides which novels
+# a run should poll. Novels with a recent (or overdue) release are polled
+# every run; quiet ones back off in proportion to how long they have been
+# quiet, and a periodic full sweep re-checks everything.
+
+import os
+import json
+import time
+import statistics
+
+from dh_xml_writer import atomic_open
+
+CADENCE_PATH = os.environ.get("DH_CADENCE_STATE", ".dh_cadence.json")
+
+# Polling knobs, in seconds unless noted; override through the environment.
+CADENCE_MIN_INTERVAL = float(os.environ.get("DH_CADENCE_MIN", "0"))          # hot novels: every run
+CADENCE_MAX_INTERVAL = float(os.environ.get("DH_CADENCE_MAX", str(12 * 3600)))
+CADENCE_SWEEP        = float(os.environ.get("DH_CADENCE_SWEEP", str(24 * 3600)))
+CADENCE_HOT_AGE      = float(os.environ.get("DH_CADENCE_HOT_AGE", str(2 * 86400)))
+CADENCE_FRACTION     = 0.1    # quiet novels: poll every 10% of the time since their last release
+CADENCE_HISTORY      = 20     # release timestamps remembered per novel
+_MIN_GAP             = 3600   # releases closer than this count as one batch
+
+
+class CadenceTracker:
+    """
+    Per-novel release history, persisted as JSON:
+
+        {"last_sweep": <epoch>,
+         "novels": {title: {"checked": <epoch>, "releases": [<epoch>, ...],
+                            "guids": [guids listed at the last poll]}}}
+
+        cadence = CadenceTracker()
+        if cadence.due(title): ... scrape ..., cadence.observe(title, [(guid, pubdate), ...])
+        cadence.save()
+    """
+
+    def __init__(self, path: str = CADENCE_PATH):
+        self.path = path
+        self.last_sweep = 0.0
+        self.novels = {}
+        self.dirty = False
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            self.last_sweep = float(state.get("last_sweep", 0))
+            self.novels = state.get("novels", {})
+        except (OSError, ValueError, AttributeError):
+            # missing or corrupt state → every novel is due
+            self.last_sweep, self.novels = 0.0, {}
+
+    def sweep_due(self, now: float = None) -> bool:
+        """True when the last full sweep is older than CADENCE_SWEEP."""
+        now = time.time() if now is None else now
+        return now - self.last_sweep >= CADENCE_SWEEP
+
+    def mark_sweep(self, now: float = None):
+        self.last_sweep = time.time() if now is None else now
+        self.dirty = True
+
+    def interval(self, title: str, now: float = None) -> float:
+        """Seconds that may pass between two polls of title."""
+        now = time.time() if now is None else now
+        releases = self.novels.get(title, {}).get("releases", [])
+        if not releases:
+            return CADENCE_MAX_INTERVAL
+        quiet = now - releases[-1]
+        if quiet < CADENCE_HOT_AGE:
+            return CADENCE_MIN_INTERVAL
+        gaps = [b - a for a, b in zip(releases, releases[1:]) if b - a >= _MIN_GAP]
+        if gaps:
+            typical = statistics.median(gaps)
+            if 0.8 * typical <= quiet <= 2 * typical:
+                # the next release is due about now
+                return CADENCE_MIN_INTERVAL
+        return min(CADENCE_MAX_INTERVAL, max(CADENCE_MIN_INTERVAL, CADENCE_FRACTION * quiet))
+
+    def due(self, title: str, now: float = None) -> bool:
+        """True when title has never been polled or its interval has elapsed."""
+        now = time.time() if now is None else now
+        entry = self.novels.get(title)
+        if not entry or "checked" not in entry:
+            return True
+        return now - entry["checked"] >= self.interval(title, now)
+
+    def observe(self, title: str, chapters, now: float = None):
+        """
+        Record a poll of title that listed chapters, as (guid, pubdate)
+        pairs. Only chapters the previous poll did not list add a release:
+        a relative date ("1 day ago") is re-anchored on every poll, so an
+        already seen chapter would come back a few minutes later each run
+        and crowd the real releases out of the history. A release within
+        _MIN_GAP of one already remembered counts as that one.
+        """
+        now = time.time() if now is None else now
+        entry = self.novels.setdefault(title, {"checked": now, "releases": []})
+        entry["checked"] = now
+        listed = dict(chapters)
+        known = set(entry.get("guids", ()))
+        releases = list(entry["releases"])
+        for guid, dt in listed.items():
+            if guid in known:
+                continue
+            stamp = int(dt.timestamp())
+            if all(abs(stamp - seen) >= _MIN_GAP for seen in releases):
+                releases.append(stamp)
+        entry["releases"] = sorted(releases)[-CADENCE_HISTORY:]
+        entry["guids"] = sorted(listed)
+        self.dirty = True
+
+    def save(self):
+        """Atomically write the state back to disk if anything changed."""
+        if not self.dirty:
+            return
+        with atomic_open(self.path) as f:
+            json.dump({"last_sweep": self.last_sweep, "novels": self.novels}, f, ensure_ascii=False)
+        self.dirty = False
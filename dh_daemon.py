@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Keeps both feed generators running in one long-lived process instead of
+cold-starting them from cron. The free and paid feeds are refreshed on
+independent intervals; between cycles the process keeps its warm state:
+the imported mapping indexes, the HTTP connection pool, the parse worker
+processes, the chapter store, the validator cache (with its parsed results)
+and the learned release cadence, which are flushed to disk after every
+cycle. Both XML files are replaced atomically, so a reader never sees a
+half-written feed.
+
+    python dh_daemon.py [--free-interval SECS] [--paid-interval SECS]
+
+Stops cleanly on SIGINT / SIGTERM once the cycles in progress finish.
+"""
+import os
+import time
+import signal
+import asyncio
+import argparse
+
+import dh_feed_generator
+import dh_paid_feed_generator
+from dh_html import ParsePool
+from dh_http import FetchScheduler, ValidatorCache, FETCH_KEEPALIVE
+from dh_cadence import CadenceTracker
+from dh_store import ChapterStore
+from dh_metrics import metrics
+
+FREE_INTERVAL = float(os.environ.get("DH_FREE_INTERVAL", "120"))   # seconds between free-feed refreshes
+PAID_INTERVAL = float(os.environ.get("DH_PAID_INTERVAL", "300"))   # seconds between paid-feed refreshes
+
+
+async def _every(name: str, interval: float, cycle, stop: asyncio.Event):
+    """
+    Run cycle() every `interval` seconds (measured start to start) until
+    stop is set. A failing cycle is logged and retried on the next tick.
+    """
+    while not stop.is_set():
+        t0 = time.monotonic()
+        try:
+            await cycle()
+        except Exception as e:
+            print(f"❌ {name} cycle failed: {e!r}")
+        elapsed = time.monotonic() - t0
+        print(f"⏱️  {name} cycle took {elapsed:.2f}s; next in {max(0.0, interval - elapsed):.0f}s")
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=max(0.0, interval - elapsed))
+        except asyncio.TimeoutError:
+            pass
+
+async def run_daemon(free_interval: float = FREE_INTERVAL, paid_interval: float = PAID_INTERVAL):
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            pass  # e.g. Windows; Ctrl-C still raises KeyboardInterrupt
+
+    cache = ValidatorCache()
+    cadence = CadenceTracker()
+    store = ChapterStore()
+    pool = ParsePool()
+    # keep idle connections around until the next cycle needs them
+    keepalive = max(FETCH_KEEPALIVE, min(free_interval, paid_interval) + 15)
+
+    async with FetchScheduler(keepalive=keepalive) as fetcher:
+        async def free_cycle():
+            try:
+                await dh_feed_generator.main_async(fetcher, cache)
+            finally:
+                cache.save()
+
+        async def paid_cycle():
+            try:
+                await dh_paid_feed_generator.main_async(True, fetcher, cache, pool, cadence, store)
+            finally:
+                cache.save()
+                cadence.save()
+                fetcher.print_latency_summary()
+                fetcher.reset_latencies()
+                # one report per paid cycle, covering the free cycles since the last one
+                metrics.write_outputs()
+                metrics.reset()
+
+        print(f"🚀 Daemon started: free feed every {free_interval:.0f}s, paid feed every {paid_interval:.0f}s")
+        try:
+            await asyncio.gather(
+                _every("free feed", free_interval, free_cycle, stop),
+                _every("paid feed", paid_interval, paid_cycle, stop),
+            )
+        finally:
+            pool.shutdown()
+            store.close()
+            cache.save()
+            cadence.save()
+    print("👋 Daemon stopped.")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Keep both Dragonholic feeds fresh from one long-running process.")
+    parser.add_argument("--free-interval", type=float, default=FREE_INTERVAL,
+                        help=f"seconds between free-feed refreshes (default {FREE_INTERVAL:.0f}, env DH_FREE_INTERVAL)")
+    parser.add_argument("--paid-interval", type=float, default=PAID_INTERVAL,
+                        help=f"seconds between paid-feed refreshes (default {PAID_INTERVAL:.0f}, env DH_PAID_INTERVAL)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(run_daemon(args.free_interval, args.paid_interval))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
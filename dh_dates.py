@@ -0,0 +1,76 @@
+# dh_dates.py
+#
+# Release-date text of a paid chapter → aware UTC datetime. A resolver
+# reads the clock once, so every relative date of a run ("3 hours ago") is
+# anchored to the same instant, and parses each distinct text only once.
+# Texts are told apart by precompiled patterns instead of trying strptime
+# and falling back on the exception.
+
+import re
+import calendar
+import datetime
+
+# "May 2, 2025": full month name (any case), day, 4-digit year
+_ABSOLUTE = re.compile(r"([A-Za-z]+)\s+(\d{1,2}),\s+(\d{4})")
+# "3 hours ago": a number, then a unit word
+_RELATIVE = re.compile(r"\s*(\d+)\s+(\S+)")
+
+_MONTHS = {name.lower(): number for number, name in enumerate(calendar.month_name) if name}
+# checked in this order, as substrings of the unit word ("mins" matches none)
+_UNITS = (
+    ("minute", datetime.timedelta(minutes=1)),
+    ("hour",   datetime.timedelta(hours=1)),
+    ("day",    datetime.timedelta(days=1)),
+    ("week",   datetime.timedelta(weeks=1)),
+)
+
+
+class DateResolver:
+    """
+    Resolves release-date texts against one clock reading, `now` (default:
+    the time it is created). Absolute dates become midnight UTC, relative
+    ones are counted back from now, and a missing or unrecognised text
+    means now. Results are memoised per text for the resolver's lifetime.
+    """
+
+    def __init__(self, now: datetime.datetime = None):
+        self.now = now or datetime.datetime.now(datetime.timezone.utc)
+        self._resolved = {None: self.now}
+
+    def resolve(self, text) -> datetime.datetime:
+        when = self._resolved.get(text)
+        if when is None:
+            when = self._resolved[text] = self._parse(text)
+        return when
+
+    def _parse(self, text: str) -> datetime.datetime:
+        m = _ABSOLUTE.fullmatch(text)
+        if m:
+            month = _MONTHS.get(m.group(1).lower())
+            day, year = int(m.group(2)), int(m.group(3))
+            if month and year >= 1 and 1 <= day <= calendar.monthrange(year, month)[1]:
+                return datetime.datetime(year, month, day, tzinfo=datetime.timezone.utc)
+        m = _RELATIVE.match(text.lower())
+        if m:
+            unit = m.group(2)
+            for name, step in _UNITS:
+                if name in unit:
+                    return self.now - step * int(m.group(1))
+        return self.now
+
+
+_shared = None
+
+def resolver_at(now: datetime.datetime = None) -> DateResolver:
+    """
+    The resolver for the run clocked at now. Every caller in this process
+    that passes the same clock (parse workers included) shares one
+    resolver and its cache; a new clock replaces it. Without a clock, a
+    fresh resolver that reads the time itself.
+    """
+    global _shared
+    if now is None:
+        return DateResolver()
+    if _shared is None or _shared.now != now:
+        _shared = DateResolver(now)
+    return _shared
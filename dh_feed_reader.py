@@ -0,0 +1,59 @@
+# dh_feed_reader.py
+#
+# Reads a feed previously written by the generators back into Chapter
+# records, so a run can start from the last published state instead of from
+# nothing.
+
+import datetime
+import xml.etree.ElementTree as ET
+
+from dh_rss import Chapter, PUBDATE_FORMAT
+from dh_mappings import NovelMeta
+
+
+def _unwrap_nameextend(text: str) -> str:
+    # writexml stores nameextend as ***text***
+    if len(text) >= 6 and text.startswith("***") and text.endswith("***"):
+        return text[3:-3]
+    return text
+
+def item_key(guid: str, link: str) -> tuple:
+    """Identity of a chapter across runs: its guid and link."""
+    return guid, link
+
+def load_feed_chapters(path: str) -> dict:
+    """
+    Returns the items of the feed at path as Chapter records keyed by
+    item_key(guid, link). A missing or unreadable file yields {}. meta
+    holds what was published (category, translator, roles, image), so a
+    comparison with freshly built items also sees mapping changes.
+    """
+    try:
+        root = ET.parse(path).getroot()
+    except (OSError, ET.ParseError):
+        return {}
+
+    chapters = {}
+    for item in root.iter("item"):
+        text = lambda tag: item.findtext(tag) or ""
+        image = item.find("featuredImage")
+        chap = Chapter(
+            title=       text("title"),
+            volume=      text("volume"),
+            chaptername= text("chaptername"),
+            nameextend=  _unwrap_nameextend(text("nameextend")),
+            link=        text("link"),
+            description= text("description"),
+            pubDate=     datetime.datetime.strptime(text("pubDate"), PUBDATE_FORMAT)
+                                          .replace(tzinfo=datetime.timezone.utc),
+            guid=        text("guid"),
+            coin=        text("coin"),
+            meta=        NovelMeta(
+                translator=      text("translator"),
+                discord_role_id= text("discord_role_id"),
+                category=        text("category"),
+                featured_image=  image.get("url", "") if image is not None else ""
+            )
+        )
+        chapters.setdefault(item_key(chap.guid, chap.link), chap)
+    return chapters
@@ -0,0 +1,149 @@
+# dh_html.py
+#
+# HTML parsing for novel pages. The scrapers only ever read the synopsis
+# (div.description-summary) and the chapter list (ul.version-chap), so by
+# default we cut those two regions out of the page with a cheap tag scan and
+# hand just that fragment to the fastest BeautifulSoup tree builder available.
+
+import os
+import re
+import asyncio
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from bs4 import BeautifulSoup
+
+try:
+    import lxml  # noqa: F401  (only needed as a BeautifulSoup tree builder)
+    HAVE_LXML = True
+except ImportError:
+    HAVE_LXML = False
+
+# "lxml" when installed, otherwise the pure-Python "html.parser".
+HTML_PARSER = os.environ.get("DH_HTML_PARSER") or ("lxml" if HAVE_LXML else "html.parser")
+
+# Set DH_HTML_TARGETED=0 to always parse the whole page.
+HTML_TARGETED = os.environ.get("DH_HTML_TARGETED", "1") != "0"
+
+# Worker processes for page parsing; 0 parses inline on the event loop.
+# Defaults to one per core, and to inline on single-core machines where a
+# worker would only add pickling overhead.
+_CORES = os.cpu_count() or 1
+PARSE_WORKERS = int(os.environ.get("DH_PARSE_WORKERS", _CORES if _CORES > 1 else 0))
+
+_DESC_START = re.compile(r"""<div\b[^>]*\bclass\s*=\s*["'][^"']*\bdescription-summary\b""", re.I)
+_LIST_START = re.compile(r"""<ul\b[^>]*\bclass\s*=\s*["'][^"']*\bversion-chap\b""", re.I)
+_TAG_EDGES = {
+    "div": re.compile(r"<(/?)div\b", re.I),
+    "ul":  re.compile(r"<(/?)ul\b", re.I),
+}
+
+# Bits of the page regions that change on every request without the chapter
+# list changing: comments, inline scripts and WordPress nonce values
+# (data-nonce="…", ?_wpnonce=…). Both patterns lead with a literal so the
+# scan stays cheap.
+_COMMENTS_SCRIPTS = re.compile(r"<!--.*?-->|<script\b.*?</script\s*>", re.I | re.S)
+_NONCE_VALUE = re.compile(r"""nonce(\s*=\s*)(?:"[^"]*"|'[^']*'|[^\s>&"']*)""")
+
+
+def _element_end(html: str, start: int, tag: str) -> int:
+    """
+    Index just past the tag that opens at html[start], matching nested
+    open/close tags of the same name. -1 if it never closes.
+    """
+    depth = 0
+    for m in _TAG_EDGES[tag].finditer(html, start):
+        depth += -1 if m.group(1) else 1
+        if depth == 0:
+            end = html.find(">", m.end())
+            return -1 if end < 0 else end + 1
+    return -1
+
+def novel_page_regions(html: str):
+    """
+    The description block and every chapter-list <ul> of a novel page, as a
+    list of HTML snippets in page order. None when no chapter list is found
+    (the caller should then fall back to the whole page).
+    """
+    regions = []
+    m = _DESC_START.search(html)
+    if m:
+        end = _element_end(html, m.start(), "div")
+        if end > 0:
+            regions.append(html[m.start():end])
+
+    found_list = False
+    pos = 0
+    while True:
+        m = _LIST_START.search(html, pos)
+        if not m:
+            break
+        end = _element_end(html, m.start(), "ul")
+        if end < 0:
+            return None
+        regions.append(html[m.start():end])
+        found_list = True
+        pos = end
+    return regions if found_list else None
+
+def novel_page_digest(html: str):
+    """
+    Hash of the normalized description and chapter-list regions of a novel
+    page, so an otherwise-unchanged page that only rotated nonces, ads or
+    scripts hashes the same. None when no chapter list is found.
+    """
+    regions = novel_page_regions(html)
+    if regions is None:
+        return None
+    text = _COMMENTS_SCRIPTS.sub("", "\n".join(regions))
+    text = " ".join(_NONCE_VALUE.sub(r"nonce\1", text).split())
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+def make_novel_soup(html: str, parser: str = None, targeted: bool = None) -> BeautifulSoup:
+    """
+    BeautifulSoup for a novel page, built with `parser` (default
+    HTML_PARSER). When targeted, only the description and chapter-list
+    regions are parsed; selectors like "ul.main.version-chap.volumns"
+    work the same on the result.
+    """
+    parser = parser or HTML_PARSER
+    targeted = HTML_TARGETED if targeted is None else targeted
+    if targeted:
+        regions = novel_page_regions(html)
+        if regions is not None:
+            html = "\n".join(regions)
+    return BeautifulSoup(html, parser)
+
+
+class ParsePool:
+    """
+    Runs CPU-bound parse functions in a ProcessPoolExecutor so the event
+    loop keeps reading responses while pages are parsed on other cores.
+    At most 2 × workers jobs are queued at a time; the rest wait, which
+    keeps memory bounded when many pages arrive at once. The executor is
+    only started on first use, so runs where every page is a 304 never
+    spawn workers.
+
+        pool = ParsePool()
+        result = await pool.run(parse_paid_chapters, html, base_url)
+        ...
+        pool.shutdown()
+    """
+
+    def __init__(self, workers: int = PARSE_WORKERS):
+        self.workers = workers
+        self.executor = None
+        self.slots = asyncio.Semaphore(max(1, workers) * 2)
+
+    async def run(self, func, *args):
+        """func(*args) in a worker process (func must be a module-level function)."""
+        if self.workers <= 0:
+            return func(*args)
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(self.workers)
+        async with self.slots:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
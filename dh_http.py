@@ -0,0 +1,248 @@
+# dh_http.py
+#
+# Shared HTTP helpers for the feed generators: a rate-limited fetch scheduler
+# and an on-disk cache of HTTP validators so unchanged pages come back as 304.
+
+import os
+import json
+import time
+import random
+import asyncio
+from collections import namedtuple
+
+import aiohttp
+
+from dh_metrics import metrics, percentile
+from dh_xml_writer import atomic_open
+
+# Where the validator cache lives between runs. The workflows save and restore it,
+# together with the cadence state and the chapter store, as one cache.
+HTTP_CACHE_PATH = os.environ.get("DH_HTTP_CACHE", ".dh_http_cache.json")
+
+# Fetch scheduling knobs; override through the environment in the workflows.
+FETCH_CONCURRENCY = int(os.environ.get("DH_FETCH_CONCURRENCY", "16"))   # requests in flight
+FETCH_PER_HOST    = int(os.environ.get("DH_FETCH_PER_HOST", "8"))       # open connections per origin
+FETCH_RATE        = float(os.environ.get("DH_FETCH_RATE", "10"))        # requests / second, 0 = unlimited
+FETCH_BURST       = int(os.environ.get("DH_FETCH_BURST", "20"))
+FETCH_TIMEOUT     = float(os.environ.get("DH_FETCH_TIMEOUT", "30"))     # seconds per attempt
+FETCH_RETRIES     = int(os.environ.get("DH_FETCH_RETRIES", "3"))
+FETCH_BACKOFF     = float(os.environ.get("DH_FETCH_BACKOFF", "0.5"))    # base delay, doubled per retry
+FETCH_MAX_BACKOFF = 10.0
+FETCH_KEEPALIVE   = float(os.environ.get("DH_FETCH_KEEPALIVE", "15"))   # idle seconds before a pooled connection is closed
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# status is 0 when the request itself failed; text is "" unless status is 200.
+# body carries the raw bytes instead of text when fetched with raw=True.
+FetchResult = namedtuple("FetchResult", "status text etag last_modified body", defaults=(None,))
+
+
+class ValidatorCache:
+    """
+    Persistent cache keyed by URL. Each entry holds the ETag and
+    Last-Modified validators of the last 200 response, plus whatever
+    parsed result the caller stored for it (must be JSON-serialisable).
+    """
+
+    def __init__(self, path: str = HTTP_CACHE_PATH):
+        self.path = path
+        self.entries = {}
+        self.dirty = False
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            # missing or corrupt cache → start cold
+            self.entries = {}
+
+    def request_headers(self, url: str) -> dict:
+        """Conditional-GET headers for url, empty if nothing usable is cached."""
+        entry = self.entries.get(url)
+        if not entry or "result" not in entry:
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def lookup(self, url: str):
+        """The parsed result stored for url, or None."""
+        entry = self.entries.get(url)
+        return entry.get("result") if entry else None
+
+    def store(self, url: str, etag, last_modified, result):
+        self.entries[url] = {
+            "etag":          etag,
+            "last_modified": last_modified,
+            "result":        result
+        }
+        self.dirty = True
+
+    def save(self):
+        """Atomically write the cache back to disk if anything changed."""
+        if not self.dirty:
+            return
+        with atomic_open(self.path) as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+        self.dirty = False
+
+
+class TokenBucket:
+    """
+    Classic token bucket: refills at `rate` tokens per second up to `burst`.
+    A rate of 0 disables limiting.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class FetchScheduler:
+    """
+    Owns the aiohttp session for a run and schedules every page fetch
+    through it: at most `concurrency` requests in flight, at most
+    `per_host` open connections per origin, a token-bucket request rate,
+    a per-request timeout and bounded retries with jittered exponential
+    backoff on timeouts, connection errors, 429 and 5xx.
+
+        async with FetchScheduler() as fetcher:
+            resp = await fetcher.fetch(url, cache)
+    """
+
+    def __init__(self,
+                 concurrency: int = FETCH_CONCURRENCY,
+                 per_host: int = FETCH_PER_HOST,
+                 rate: float = FETCH_RATE,
+                 burst: int = FETCH_BURST,
+                 timeout: float = FETCH_TIMEOUT,
+                 retries: int = FETCH_RETRIES,
+                 backoff: float = FETCH_BACKOFF,
+                 keepalive: float = FETCH_KEEPALIVE):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.keepalive = keepalive
+        self.bucket = TokenBucket(rate, burst)
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.latencies = []
+        self.session = None
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.per_host,
+                                         keepalive_timeout=self.keepalive)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+
+    def _delay(self, attempt: int, retry_after=None) -> float:
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), FETCH_MAX_BACKOFF)
+        # "full jitter": anywhere between 0 and the exponential ceiling
+        return random.uniform(0, min(FETCH_MAX_BACKOFF, self.backoff * 2 ** attempt))
+
+    async def fetch(self, url: str, cache: ValidatorCache = None, raw: bool = False) -> FetchResult:
+        """
+        Fetch a page, sending If-None-Match / If-Modified-Since when cache
+        holds validators for url. On non-200/304 or once retries are used
+        up, log & return a FetchResult with empty text. With raw=True the
+        undecoded body is returned in .body (e.g. for feedparser, which
+        does its own charset detection). gzip/deflate – and brotli when the
+        Brotli package is installed – are negotiated and decoded by aiohttp.
+        """
+        headers = cache.request_headers(url) if cache is not None else {}
+        result, attempts = FetchResult(0, "", None, None), 0
+        timing = [0.0, 0.0]   # [seconds on the wire, seconds queued for a slot + token]
+        try:
+            result, attempts = await self._fetch(url, headers, raw, timing)
+            return result
+        finally:
+            elapsed, queued = timing
+            self.latencies.append(elapsed)
+            nbytes = len(result.body) if result.body is not None else len(result.text.encode("utf-8"))
+            metrics.record_fetch(url, result.status, elapsed, nbytes, attempts, queued)
+
+    async def _fetch(self, url: str, headers: dict, raw: bool, timing: list):
+        """
+        (FetchResult, attempts made) for one URL, retrying as described in
+        fetch(). Adds each attempt's request time to timing[0] and its wait
+        for a slot and a token to timing[1]; backoff sleeps count as neither.
+        """
+        attempt = 0
+        while True:
+            retry_after = None
+            waiting = time.monotonic()
+            async with self.semaphore:
+                await self.bucket.acquire()
+                started = time.monotonic()
+                timing[1] += started - waiting
+                try:
+                    async with self.session.get(url, headers=headers) as resp:
+                        if resp.status == 304:
+                            return FetchResult(304, "", None, None), attempt + 1
+                        if resp.status == 200:
+                            etag = resp.headers.get("ETag")
+                            last_modified = resp.headers.get("Last-Modified")
+                            if raw:
+                                return FetchResult(200, "", etag, last_modified, await resp.read()), attempt + 1
+                            return FetchResult(200, await resp.text(), etag, last_modified), attempt + 1
+                        if resp.status not in RETRY_STATUSES or attempt >= self.retries:
+                            print(f"⚠️  Warning: {url} returned HTTP {resp.status}")
+                            return FetchResult(resp.status, "", None, None), attempt + 1
+                        retry_after = resp.headers.get("Retry-After")
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    if attempt >= self.retries:
+                        print(f"⚠️  Error fetching {url}: {e!r}")
+                        return FetchResult(0, "", None, None), attempt + 1
+                except Exception as e:
+                    print(f"⚠️  Error fetching {url}: {e}")
+                    return FetchResult(0, "", None, None), attempt + 1
+                finally:
+                    timing[0] += time.monotonic() - started
+            # sleep outside the semaphore so a backing-off URL doesn't hold a slot
+            await asyncio.sleep(self._delay(attempt, retry_after))
+            attempt += 1
+
+    def latency_summary(self) -> dict:
+        values = sorted(self.latencies)
+        return {
+            "count": len(values),
+            "p50":   percentile(values, 50),
+            "p90":   percentile(values, 90),
+            "p99":   percentile(values, 99),
+            "max":   values[-1] if values else 0.0,
+        }
+
+    def print_latency_summary(self):
+        s = self.latency_summary()
+        print(f"⏱️  {s['count']} fetches: p50 {s['p50']:.2f}s · p90 {s['p90']:.2f}s · "
+              f"p99 {s['p99']:.2f}s · max {s['max']:.2f}s")
+
+    def reset_latencies(self):
+        """Start a fresh latency window (long-running callers, once per cycle)."""
+        self.latencies = []
@@ -1,451 +1,255 @@
 # dh_mappings.py
+#
+# Translator, Discord role, URL, NSFW and featured-image mappings. The data
+# lives in dh_mappings.json; this module validates it and builds the lookup
+# indexes. The built indexes are pickled to a sidecar keyed by a hash of
+# the JSON and of the code that builds them, so an import with unchanged
+# data and code only unpickles them.
+
+import os
+import re
+import json
+import pickle
+import hashlib
+from typing import NamedTuple
+
+from dh_title_index import TitleIndex
+from dh_text import slug
+from dh_xml_writer import atomic_open
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+MAPPINGS_PATH       = os.environ.get("DH_MAPPINGS", os.path.join(_HERE, "dh_mappings.json"))
+MAPPINGS_CACHE_PATH = os.environ.get("DH_MAPPINGS_CACHE", os.path.join(_HERE, ".dh_mappings.cache"))
+# the code whose output is pickled: any edit to it invalidates the sidecar
+_CACHE_SOURCES = (
+    os.path.abspath(__file__),
+    os.path.join(_HERE, "dh_title_index.py"),
+    os.path.join(_HERE, "dh_text.py"),
+)
+
+NOVEL_BASE_URL = "https://dragonholic.com/novel/"
+
+_ROLE_ID = re.compile(r"<@&\d+>")
 
-# Mapping dictionary for translator names to their list of novel titles.
-TRANSLATOR_NOVEL_MAP = {
-    "Cannibal Turtle": [
-        "Quick Transmigration: The Villain Is Too Pampered and Alluring"
-    ],
-    "Bluesky": [
-        "People who eat melon are in 70",
-        "Help others? It’s better to help yourself"
-    ],
-    "alara": [
-        "Fever Break",
-        "My Husband Became the Most Powerful Minister"
-    ],
-    "Snowbun": [
-        "Rebirth of the Excellent Daughter of the Marquis Household (REDMH)",
-        "The Eldest Legitimate Daughter is Both Beautiful and Valiant (ELDBBV)"
-    ],
-    "Kat": [
-        "After Rebirth, I Married my Archenemy",
-        "Giving Interstellar Players a Horror Ghost Game Shock",
-        "Transmigrated into the Villain's Cannon Fodder Ex-Wife (Transmigrated into a Book)"
-    ],
-    "silverriver": [
-        "To Those Who Regretted After I Died"
-    ],
-    "tscatthed": [
-        "Phoenix Girl in the 1990s"
-    ],
-    "Eastwalk": [
-        "I Am Being Mistaken for a Genius Strategist"
-    ],
-    "Bunnyyy": [
-        "The Wind Heard Her Confession"
-    ],
-    "UchihaDavinchi": [
-        "Disappointing Teleportation Magic ~ Even Though The Movement Distance Is Only 1 Millimeter, I Will Rise Through Ingenuity ~",
-        "Reincarnated as a Farmer Gamer: Rising to the Top with the Evolution of the Weakest Job that Only I Know About!?",
-        "The Great Sage Who Did not Remain in Legend",
-        "After Retirement, Living a Stud Life in Another World",
-        "Bondage and Marriage",
-        "Clap",
-        "Double Junk",
-        "I Have been Reincarnated As a Lazy, Arrogant Noble, but When I Destroyed The Scenario Through Effort, I Became The Most Powerful With Extraordinary Magical Power",
-        "My Bloody Valentine",
-        "Reasonable Loss",
-        "Red Dot",
-        "The Goddess Granted Me the [Hatching] Skill and Somehow I Became the Strongest Tamer, Commanding Mythical and Divine Beasts",
-        "The Second Son of The Marquis Runs Away from Home ~ Lacking Talent, He Abandons Everything and Becomes an Adventurer ~"
-    ],
-    "Athena": [
-        "The Tyrant's Happy Ending",
-        "When I started High School, My Childhood Friend, who had suddenly become distant and cold, was harassed by a stranger. I stepped in to help, and as a result, from the following day, My Childhood Friend's behavior became unusual.",
-        "A Forest flowing with Milk and Honey",
-        "The Sickly Villainess: No, I Wasn’t Poisoned! I'm Just Frail!",
-        "Zion's Garden",
-        "The Young Male Protagonist Who is Destined for Ruin Fell for Me",
-        "The Final Task of the Forsaken Saint: A Command to Marry the Barbarian Count",
-        "When the Mid-Boss Villainous Noble Recalls Memories of a Past Life and Gains Game Knowledge. I Will Never Accept a Future Where I'm Called the Jealous Earl"
-    ],
-    "Huangluan De Bai Huangshulang": [
-        "Legend Of The Frost Blade"
-    ],
-    "Frian": [
-        "Global Descent to Sky Islands: Getting a God-level Talent from the Start"
-    ],
-    "Luojiu": [
-        "Diary of my Ex",
-        "Gloria von Caldwell's Condemnation and Revenge"
-    ],
-    "An'er": [
-        "After Transmigrating, I and the Female Lead Both Found It 'Really Fragrant' (GL)",
-        "The Female Lead is Looking at Me Differently (GL)",
-        "A Moment Too Late (GL)",
-        "The Male Lead's Harem Belongs to Me (GL)",
-        "After Transmigrating, I Married the Male Lead’s Sister (GL)",
-        "Confession to You in Early Summer (GL)"
-    ],
-    "amee": [
-        "Guide to the Fallen World"
-    ],
-    "Sunnie": [
-        "The Three baby mining brothers"
-    ],
-    "silversoul": [
-        "I Want to Avoid the Bad Ending"
-    ],
-    "ciasuraimu": [
-        "If You Want To Frame Me As a Villainess, I Will Be The Villainess. However.",
-        "Proof of the Demon Lord's Innocence"
-    ],
-    "Yijuan": [
-        "Waiting for the Stars to Fall",
-        "I Am Just Sad That I Can’t Grow Old With You"
-    ],
-    "emberblood": [
-        "In this life, I will no longer be a scumbag to my childhood sweetheart",
-    ],
-    "Beryline": [
-        "Little Blind Girl"
-    ],
-    "Sia": [
-        "With Multiple Babies, Who Still Wants to Be the Marquess’s Wife?"
-    ],
-    "Thyllia": [
-        "The Young Marquis Regrets Too Late"
-    ],
-    "kuro": [
-        "The Unspoken Vow"
-    ],
-     "Niang'er": [
-        "Mistakenly Treated The Princess As A Concubine",
-        "The Eunuch Has A Wife",
-        "Transmigrating Before The Crazy Beauty Scum A Loses Control",
-        "Don't Provoke the Black Lotus O [Transmigration Novel]",
-        "The Foolish General's Mute Spouse"
-    ],
-     "Wolffy": [
-        "Honkai: Star Rail, My Journey with Tom"
-    ],
-     "Eris81194": [
-        "Did Mrs. Sheng Got Divorced Today?",
-        "The Strongest Delivery Man",
-        "Sweet Hunting Ground [GB]"
-    ],
-     "Maomai": [
-        "Wicked Island Of Ireland"
-    ],
-     "gediahp": [
-        "The Story of How I Pretended To Be A Boy and Ended Up Being Loved By A Mafia Boss",
-        "With The Fifth Loop, The Third Prince Has Been Added To The Cast.",
-        "The White Moonlight Disdained by the Male Protagonist of Redemption",
-        "The Heroic Tale of the Weakest Ability User ~The F-Ranker with the Dual Pistols~",
-        "Crossing the Two Realms: From a Trader to an Immortal Emperor",
-        "Commoner Queen: Falling in Love with His Royal Highness the Crown Prince",
-        "\"On the Day of Reunion, The Heir to the Wealthy Family Became My Brother\"",
-        "Sweet Kiss",
-        "It Was A Fake Marriage, But Jiu Qian Sui Took It Seriously",
-        "Dare to Cancel the Engagement? I Will Marry Your Ancestor!",
-        "Banishment is Fine: As a Genius Saint, I Can Shine Anywhere.",
-        "The Necromance of Love and Death: Defeated Early in the Game, I Reincarnated as a Tragic Villainous Noble and Rebel Against the Scenario with My Beloved Using My Modern and Game Knowledge"
-    ],
-     "SinisterError": [
-        "I’m the Eldest Son of a Poor Family, but My Magical Talent Awakened While Working Hard for My Family"
-    ],
-     "Xueran": [
-        "Little Fish and Mint"
-    ],
-     "Xyvandar": [
-        "Accidentally Marked My Ex’s Crush, the Ice-Cold Goddess O",
-        "After Becoming the Abused Heroine in a Campus Story",
-        "After Going on a Blind Date With My Omega Love Rival",
-        "After the Top Idol Omega and I Started Living Together",
-        "After Transmigrating Into a Book, I Was Forced to Play the Role of a Scumbag Alpha (GL)",
-        "Dressed as the Scumbag Alpha Mom of the Tragic Female Lead",
-        "Failed to Pretend to Be an Alpha and Got Marked by the Enemy",
-        "The Little Bookworm Marked Her Ex-aunt",
-        "Transmigrated as a Cannon Fodder Wife A in Ancient Times",
-        "Transmigrated Into an Ancient Famine Novel as a Scumbag Alpha (ABO, GL)" 
-    ],
-     "☾ᵐᵒᵒⁿ — ": [
-        "Within The Sound of Swallows"
-    ],
-     "Bookloverobsess": [
-        "A Hundred Of Beautiful Lives"
-    ],
-     "lumielle": [
-        "Sylvie, the Slave Girl (Lily Futa)"
-    ],
-     "Hyera22": [
-        "New Normal",
-        "Mudoo",
-        "Small and Fragile Things",
-        "Defective Banana"
-    ],
-     "Chel1206": [
-        "Breaking the Taboo (1v2, Blood Uncle and Nephew)",
-        "The Vicious Supporting Villainess’s Chronicle of Serving Pleasure (Historical 1v1, H)"
-    ],
-     "galxscp": [
-        "Strategy to Conquer the Vicious Female Supporting Character [Quick Transmigration]"
-    ]
-}
 
-# Mapping for Discord role IDs.
-DISCORD_ROLE_ID_MAP = {
-    "Cannibal Turtle": "<@&1286581623848046662>",
-    "Bluesky": "<@&1291243923238555749>",
-    "alara": "<@&1291243990275985441>",
-    "Snowbun": "<@&1291253678103330829>",
-    "Kat": "<@&1295572430370377779>",
-    "silverriver": "<@&1295572692853854228>",
-    "tscatthed": "<@&1295572751775436911>",
-    "Eastwalk": "<@&1295581200706179112>",
-    "Bunnyyy": "<@&1302831622009126923>",
-    "UchihaDavinchi": "<@&1309162305745064038>",
-    "Athena": "<@&1314845173284343809>",
-    "Huangluan De Bai Huangshulang": "<@&1315579651237613589>",
-    "Frian": "<@&1315580646298750976>",
-    "Luojiu": "<@&1315579753604055041>",
-    "An'er": "<@&1315580006549815306>",
-    "amee": "<@&1316342133698854944>",
-    "Sunnie": "<@&1316342244676210729>",
-    "silversoul": "<@&1318494169471127552>",
-    "ciasuraimu": "<@&1323168986044563561>",
-    "Yijuan": "<@&1323169058706690106>",
-    "emberblood": "<@&1323169218262335519>",
-    "Beryline": "<@&1323169289058127944>",
-    "Sia": "<@&1323169355948752967>",
-    "Thyllia": "<@&1341625811828215819>",
-    "kuro": "<@&1341625880845221919>",
-    "Niang'er": "<@&1341672245407256577>",
-    "Wolffy": "<@&1341672309781565551>",
-    "Eris81194": "<@&1359458280644284449>",
-    "Maomai": "<@&1291253732410920991>",
-    "gediahp": "<@&1362279346441818223>",
-    "SinisterError": "<@&1364833561135550534>",    
-    "Xueran": "<@&1370239063260528750>",  
-    "Xyvandar": "<@&1378148387790262442>",
-    "☾ᵐᵒᵒⁿ": "<@&1378148523597496333>",
-    "Bookloverobsess": "<@&1378148687104184433>",
-    "lumielle": "<@&1378270930752507904>",
-    "Hyera22": "<@&1395707595070767104>",
-    "Chel1206": "<@&1422045826850488340>",
-    "galxscp": "<@&1422044766337499167>",
+class MappingsError(ValueError):
+    """dh_mappings.json is not valid JSON or breaks the schema; one problem per line."""
+
+
+class NovelMeta(NamedTuple):
+    translator: str
+    discord_role_id: str     # translator role, plus the NSFW role for NSFW titles
+    category: str            # "NSFW" or "SFW"
+    featured_image: str
+
+
+# ---- validation -----------------------------------------------------------
+# top-level key → (type, type of its items or values)
+_SCHEMA = {
+    "translators":         (dict, list),
+    "discord_roles":       (dict, str),
+    "nsfw_role":           (str, None),
+    "nsfw_novels":         (list, str),
+    "novel_url_overrides": (dict, str),
+    "featured_images":     (dict, str),
 }
 
+def _bad_name(text) -> bool:
+    return not isinstance(text, str) or not text or text != text.strip()
+
+def validate_mappings(data) -> tuple[list, list]:
+    """
+    (errors, warnings) for parsed mappings data. Errors make the data
+    unusable: wrong shape, titles that are empty or padded with
+    whitespace, a title mapped twice, an NSFW title that matches no mapped
+    novel, a malformed role ID or URL. Warnings are loose ends that still
+    load: translators without a role, roles without a translator, and
+    images or URL overrides for titles nobody translates.
+    """
+    if not isinstance(data, dict):
+        return ["top level must be an object"], []
+    errors, warnings = [], []
+    for key in data.keys() - _SCHEMA.keys():
+        errors.append(f"unknown key {key!r}")
+    for key, (kind, inner) in _SCHEMA.items():
+        value = data.get(key)
+        if not isinstance(value, kind):
+            errors.append(f"{key!r} must be a {kind.__name__}")
+            continue
+        items = value.values() if kind is dict else value if kind is list else ()
+        if any(not isinstance(v, inner) for v in items):
+            errors.append(f"every entry of {key!r} must be a {inner.__name__}")
+    if errors:
+        return errors, warnings
+
+    translators = data["translators"]
+    mapped = {}
+    for translator, titles in translators.items():
+        if _bad_name(translator):
+            errors.append(f"translator name {translator!r} is empty or has surrounding whitespace")
+        for title in titles:
+            if _bad_name(title):
+                errors.append(f"title {title!r} of {translator!r} is empty or has surrounding whitespace")
+            elif title in mapped:
+                errors.append(f"title {title!r} is listed under both {mapped[title]!r} and {translator!r}")
+            else:
+                mapped[title] = translator
+
+    roles = data["discord_roles"]
+    for translator, role in [(None, data["nsfw_role"])] + list(roles.items()):
+        if not _ROLE_ID.fullmatch(role):
+            errors.append(f"role {role!r} of {translator or 'nsfw_role'!r} is not of the form <@&123…>")
+    for translator in translators.keys() - roles.keys():
+        warnings.append(f"translator {translator!r} has no Discord role")
+    for translator in roles.keys() - translators.keys():
+        warnings.append(f"Discord role for {translator!r}, who has no novels")
+
+    seen = set()
+    for title in data["nsfw_novels"]:
+        if title in seen:
+            errors.append(f"NSFW title {title!r} is listed twice")
+        elif title not in mapped:
+            # also what a missing comma between two titles turns into
+            errors.append(f"NSFW title {title!r} is not a mapped novel")
+        seen.add(title)
+
+    for key in ("novel_url_overrides", "featured_images"):
+        for title, url in data[key].items():
+            if not url.startswith("https://"):
+                errors.append(f"{key} URL {url!r} for {title!r} is not https://")
+            if title not in mapped:
+                warnings.append(f"{key} entry {title!r} is not a mapped novel")
+    return errors, warnings
+
+def _no_duplicate_keys(pairs, duplicates: list):
+    obj = {}
+    for key, value in pairs:
+        if key in obj:
+            duplicates.append(f"key {key!r} appears twice in one object")
+        obj[key] = value
+    return obj
+
+def parse_mappings(raw: bytes):
+    """(data, warnings) from the bytes of a mappings file; raises MappingsError."""
+    duplicates = []
+    try:
+        data = json.loads(raw.decode("utf-8"),
+                          object_pairs_hook=lambda pairs: _no_duplicate_keys(pairs, duplicates))
+    except ValueError as e:
+        raise MappingsError(f"not valid JSON: {e}") from None
+    errors, warnings = validate_mappings(data)
+    errors = duplicates + errors
+    if errors:
+        raise MappingsError("\n".join(errors))
+    return data, warnings
+
+
+# ---- indexes + sidecar ----------------------------------------------------
+def build_indexes(data) -> dict:
+    """Everything the lookups below need, precomputed from validated data."""
+    translators = data["translators"]
+    roles = data["discord_roles"]
+    nsfw = frozenset(data["nsfw_novels"])
+    overrides = data["novel_url_overrides"]
+    images = data["featured_images"]
+    translator_index = TitleIndex((novel, translator)
+                                  for translator, novels in translators.items()
+                                  for novel in novels)
+    image_index = TitleIndex(images.items())
+
+    novel_urls, novel_meta = {}, {}
+    for translator, novels in translators.items():
+        for title in novels:
+            novel_urls[title] = overrides.get(title) or f"{NOVEL_BASE_URL}{slug(title)}/"
+            # same answer get_novel_meta would compute; a title can contain
+            # an earlier-listed title, so ask the index, not the loop
+            owner = translator_index.lookup(title)
+            role = roles.get(owner, "")
+            category = "NSFW" if title in nsfw else "SFW"
+            if category == "NSFW":
+                role += " " + data["nsfw_role"]
+            novel_meta[title] = (owner, role, category, image_index.lookup(title, ""))
+    return {
+        "data":             data,
+        "nsfw":             nsfw,
+        "translator_index": translator_index,
+        "image_index":      image_index,
+        "novel_urls":       novel_urls,
+        "novel_meta":       novel_meta,   # plain tuples: unpickles wherever this module runs as
+    }
+
+def _write_sidecar(path: str, key: str, indexes: dict):
+    try:
+        with atomic_open(path, "wb") as f:
+            pickle.dump((key, indexes), f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass    # e.g. a read-only checkout: the sidecar is only a cache, rebuild next time
+
+def _sidecar_key(raw: bytes) -> str:
+    """Hash of the mappings file contents and of the code in _CACHE_SOURCES."""
+    h = hashlib.blake2b(digest_size=16)
+    for source in _CACHE_SOURCES:
+        with open(source, "rb") as f:
+            h.update(f.read())
+    h.update(raw)
+    return h.hexdigest()
+
+def load_mappings(path: str = MAPPINGS_PATH, cache_path: str = MAPPINGS_CACHE_PATH) -> dict:
+    """
+    The indexes for the mappings file at path: unpickled from cache_path
+    when it was built from the same file contents by the same code,
+    otherwise parsed, validated, built and written back there. Raises
+    MappingsError.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    key = _sidecar_key(raw)
+    if cache_path:
+        try:
+            with open(cache_path, "rb") as f:
+                cached_key, indexes = pickle.load(f)
+            if cached_key == key:
+                return indexes
+        except Exception:
+            pass  # missing, stale or corrupt sidecar → rebuild
+    data, _ = parse_mappings(raw)
+    indexes = build_indexes(data)
+    if cache_path:
+        _write_sidecar(cache_path, key, indexes)
+    return indexes
+
+
+_MAPPINGS = load_mappings()
+
+# Mapping dictionary for translator names to their list of novel titles.
+TRANSLATOR_NOVEL_MAP = _MAPPINGS["data"]["translators"]
+DISCORD_ROLE_ID_MAP  = _MAPPINGS["data"]["discord_roles"]
+FEATURED_IMAGE_MAP   = _MAPPINGS["data"]["featured_images"]
+# URL overrides for novels whose page URL isn't the slug of their title.
+NOVEL_URL_OVERRIDES  = _MAPPINGS["data"]["novel_url_overrides"]
+# NSFW titles (exact match); their items get the NSFW category and role.
+NSFW_NOVELS  = _MAPPINGS["nsfw"]
+NSFW_ROLE_ID = _MAPPINGS["data"]["nsfw_role"]
+
+_TRANSLATOR_INDEX     = _MAPPINGS["translator_index"]
+_FEATURED_IMAGE_INDEX = _MAPPINGS["image_index"]
+_NOVEL_URLS           = _MAPPINGS["novel_urls"]
+
 def get_translator(title):
     """
-    Determines the translator based on the title by iterating through
-    TRANSLATOR_NOVEL_MAP. Returns the translator's name if a match is found,
-    otherwise returns None.
+    Determines the translator based on the title: the translator of the
+    first novel in TRANSLATOR_NOVEL_MAP contained in the title.
+    Returns None if there is no match.
     """
-    for translator, novels in TRANSLATOR_NOVEL_MAP.items():
-        for novel in novels:
-            if novel in title:
-                return translator
-    return None
-    
+    return _TRANSLATOR_INDEX.lookup(title)
+
 def get_featured_image(title):
     """
-    Determines the featured image URL based on the title
-    using a dictionary mapping rather than multiple if-statements.
-    If no image is found, returns an empty string.
+    Determines the featured image URL based on the title using
+    FEATURED_IMAGE_MAP. If no image is found, returns an empty string.
     """
-    featured_image_map = {
-        "Quick Transmigration: The Villain Is Too Pampered and Alluring":
-            "https://dragonholic.com/wp-content/uploads/2024/08/177838.jpg",
-        "People who eat melon are in 70":
-            "https://dragonholic.com/wp-content/uploads/2024/08/051115320281.jpg",
-        "Help others? It’s better to help yourself":
-            "https://dragonholic.com/wp-content/uploads/2024/09/p2oe6e7b1cf7089dd2a93d9de5610195b4etplv-resize_225_0.jpeg",
-        "Fever Break":
-            "https://dragonholic.com/wp-content/uploads/2024/09/fever.jpeg",
-        "My Husband Became the Most Powerful Minister":
-            "https://dragonholic.com/wp-content/uploads/2024/09/MHHM.jpg",
-        "Rebirth of the Excellent Daughter of the Marquis Household (REDMH)":
-            "https://dragonholic.com/wp-content/uploads/2024/08/Rebirth-of-the-Excellent-Daughter-of-the-Marquis-Household.jpg",
-        "The Eldest Legitimate Daughter is Both Beautiful and Valiant (ELDBBV)":
-            "https://dragonholic.com/wp-content/uploads/2024/08/35024s.jpg",
-        "After Rebirth, I Married my Archenemy":
-            "https://dragonholic.com/wp-content/uploads/2024/10/20240408222407_200_280.jpg",
-        "Giving Interstellar Players a Horror Ghost Game Shock":
-            "https://dragonholic.com/wp-content/uploads/2024/11/p2o7cde861d43970ef6d4b238d990d1af35tplv-resize_225_0.png",
-        "Transmigrated into the Villain's Cannon Fodder Ex-Wife (Transmigrated into a Book)":
-            "https://dragonholic.com/wp-content/uploads/2024/11/332274s-1.jpg",
-        "To Those Who Regretted After I Died":
-            "https://dragonholic.com/wp-content/uploads/2024/10/COVER2.jpg",
-        "Phoenix Girl in the 1990s":
-            "https://dragonholic.com/wp-content/uploads/2024/08/Phoenix-Girl-in-the-90s-Cover-OG.png",
-        "I Am Being Mistaken for a Genius Strategist":
-            "https://dragonholic.com/wp-content/uploads/2025/01/IABMGS-Cover.jpg",
-        "The Wind Heard Her Confession":
-            "https://dragonholic.com/wp-content/uploads/2024/11/5777c31e83d6f0b5.jpg",
-        "After Retirement, Living a Stud Life in Another World":
-            "https://dragonholic.com/wp-content/uploads/2024/11/stud-life.jpeg",
-        "Bondage and Marriage":
-            "https://dragonholic.com/wp-content/uploads/2024/11/Bondage.jpg",
-        "Clap":
-            "https://dragonholic.com/wp-content/uploads/2024/11/clap.jpg",
-        "Double Junk":
-            "https://dragonholic.com/wp-content/uploads/2024/11/double-skin.jpg",
-        "I Have been Reincarnated As a Lazy, Arrogant Noble, but When I Destroyed The Scenario Through Effort, I Became The Most Powerful With Extraordinary Magical Power":
-            "https://dragonholic.com/wp-content/uploads/2024/11/weiss.jpg",
-        "My Bloody Valentine":
-            "https://dragonholic.com/wp-content/uploads/2024/11/My-Bloody-Valentine.jpg",
-        "Reasonable Loss":
-            "https://dragonholic.com/wp-content/uploads/2024/11/reasonable-loss.jpg",
-        "Red Dot":
-            "https://dragonholic.com/wp-content/uploads/2024/11/Red-Dot.jpg",
-        "The Goddess Granted Me the [Hatching] Skill and Somehow I Became the Strongest Tamer, Commanding Mythical and Divine Beasts":
-            "https://dragonholic.com/wp-content/uploads/2024/11/hatch-phoenix.jpg",
-        "The Tyrant's Happy Ending":
-            "https://dragonholic.com/wp-content/uploads/2024/10/ty.jpg",
-        "When I started High School, My Childhood Friend, who had suddenly become distant and cold, was harassed by a stranger. I stepped in to help, and as a result, from the following day, My Childhood Friend's behavior became unusual.":
-            "https://dragonholic.com/wp-content/uploads/2024/11/highschool.jpg",
-        "A Forest flowing with Milk and Honey":
-            "https://dragonholic.com/wp-content/uploads/2024/10/forest.jpg",
-        "The Sickly Villainess: No, I Wasn’t Poisoned! I'm Just Frail!":
-            "https://dragonholic.com/wp-content/uploads/2024/11/sickly.jpg",
-        "Zion's Garden":
-            "https://dragonholic.com/wp-content/uploads/2024/11/zions-garden.jpg",
-        "The Young Male Protagonist Who is Destined for Ruin Fell for Me":
-            "https://dragonholic.com/wp-content/uploads/2024/10/young-protagonist-102624.jpg",
-        "The Final Task of the Forsaken Saint: A Command to Marry the Barbarian Count":
-            "https://dragonholic.com/wp-content/uploads/2024/11/bAbarian.jpg",
-        "When the Mid-Boss Villainous Noble Recalls Memories of a Past Life and Gains Game Knowledge. I Will Never Accept a Future Where I'm Called the Jealous Earl":
-            "https://dragonholic.com/wp-content/uploads/2024/11/boss.jpg",
-        "Legend Of The Frost Blade":
-            "https://dragonholic.com/wp-content/uploads/2024/11/Screenshot-2024-10-27-at-6.16.41 PM-1.jpg",
-        "Global Descent to Sky Islands: Getting a God-level Talent from the Start":
-            "https://dragonholic.com/wp-content/uploads/2024/12/image_2024-12-07_151830286.png",
-        "Diary of my Ex":
-            "https://dragonholic.com/wp-content/uploads/2024/11/9081b7c3f61d976fd2e16d91ae58f04d.jpeg",
-        "Gloria von Caldwell's Condemnation and Revenge":
-            "https://dragonholic.com/wp-content/uploads/2024/12/file-7TuN1ag8iWABh9WqdMESHF.webp",
-        "After Transmigrating, I and the Female Lead Both Found It 'Really Fragrant' (GL)":
-            "https://dragonholic.com/wp-content/uploads/2024/11/download-1.jpeg",
-        "The Female Lead is Looking at Me Differently (GL)":
-            "https://dragonholic.com/wp-content/uploads/2024/10/download-3.jpeg",
-        "A Moment Too Late (GL)":
-            "https://dragonholic.com/wp-content/uploads/2024/08/images-1.jpeg",
-        "The Male Lead's Harem Belongs to Me (GL)":
-            "https://dragonholic.com/wp-content/uploads/2024/11/novelimage-10.png",
-        "After Transmigrating, I Married the Male Lead’s Sister (GL)":
-            "https://dragonholic.com/wp-content/uploads/2024/11/novelimage-9.png",
-        "Confession to You in Early Summer (GL)":
-            "https://dragonholic.com/wp-content/uploads/2024/12/20201118203028_200_280.jpg",
-        "Guide to the Fallen World":
-            "https://dragonholic.com/wp-content/uploads/2024/11/images-3.jpeg",
-        "The Three baby mining brothers":
-            "https://dragonholic.com/wp-content/uploads/2024/12/FZMzZOtUIAEv62-.jpg",
-        "After Marrying the Disabled Prince (BG)":
-            "https://dragonholic.com/wp-content/uploads/2024/12/143300s.jpg",
-        "I Want to Avoid the Bad Ending":
-            "https://dragonholic.com/wp-content/uploads/2024/10/xxlarge.webp",
-        "If You Want To Frame Me As a Villainess, I Will Be The Villainess. However.":
-            "https://dragonholic.com/wp-content/uploads/2024/11/悪役令嬢に仕立て上げたいのならば、悪役令嬢になってあげましょう。ただし。.jpg",
-        "Waiting for the Stars to Fall":
-            "https://dragonholic.com/wp-content/uploads/2024/12/s33790513.jpg",
-        "I Am Just Sad That I Can’t Grow Old With You":
-            "https://dragonholic.com/wp-content/uploads/2024/12/s34911597.jpg",
-        "In this life, I will no longer be a scumbag to my childhood sweetheart":
-            "https://placeholder.com/image_no_longer_scumbag",
-        "Little Blind Girl":
-            "https://dragonholic.com/wp-content/uploads/2024/11/The-Blind-Girl.jpg",
-        "With Multiple Babies, Who Still Wants to Be the Marquess’s Wife?":
-            "https://dragonholic.com/wp-content/uploads/2024/09/cover.jpg",
-        "The Young Marquis Regrets Too Late":
-            "https://dragonholic.com/wp-content/uploads/2024/12/20241207081825_200_280.jpg",
-        "The Unspoken Vow":
-            "https://dragonholic.com/wp-content/uploads/2025/01/xxlarge.webp",
-        "Mistakenly Treated The Princess As A Concubine":
-            "https://dragonholic.com/wp-content/uploads/2025/01/20240429163423_200_280.jpg",
-        "Honkai: Star Rail, My Journey with Tom":
-            "https://dragonholic.com/wp-content/uploads/2025/02/Star-rail-novel-cover.jpg",
-        "Proof of the Demon Lord's Innocence":
-            "https://dragonholic.com/wp-content/uploads/2025/01/魔王陛下の無罪証明.jpg",
-        "Did Mrs. Sheng Got Divorced Today?":
-            "https://dragonholic.com/wp-content/uploads/2025/03/2368667.jpg",
-        "The Strongest Delivery Man":
-            "https://dragonholic.com/wp-content/uploads/2025/03/IMG_2420.webp",
-        "Sweet Hunting Ground [GB]":
-            "https://dragonholic.com/wp-content/uploads/2025/03/IMG_2433.jpeg",
-        "The Eunuch Has A Wife":
-            "https://dragonholic.com/wp-content/uploads/2025/02/219979s.jpg",
-        "Transmigrating Before The Crazy Beauty Scum A Loses Control":
-            "https://dragonholic.com/wp-content/uploads/2025/02/273025s.jpg",
-        "Don't Provoke the Black Lotus O [Transmigration Novel]":
-            "https://dragonholic.com/wp-content/uploads/2025/03/324340s.jpg",
-        "The Foolish General's Mute Spouse":
-            "https://dragonholic.com/wp-content/uploads/2025/03/342226s.jpg",
-        "Wicked Island Of Ireland":
-            "https://dragonholic.com/wp-content/uploads/2025/03/Wicked-Island-Of-Ireland1.jpg",
-        "The Story of How I Pretended To Be A Boy and Ended Up Being Loved By A Mafia Boss":
-            "https://dragonholic.com/wp-content/uploads/2025/04/38c9e83d-06c6-4d11-9067-121b2aef8af6.jpeg",
-        "With The Fifth Loop, The Third Prince Has Been Added To The Cast.":
-            "https://dragonholic.com/wp-content/uploads/2025/04/manhwa-style-with-a-prince-and-a-woman.jpg",
-        "The White Moonlight Disdained by the Male Protagonist of Redemption":
-            "https://dragonholic.com/wp-content/uploads/2025/04/133878576051325034.jpg",
-        "The Heroic Tale of the Weakest Ability User ~The F-Ranker with the Dual Pistols~":
-            "https://dragonholic.com/wp-content/uploads/2025/03/DALL%C2%B7E-2025-03-19-23.24.13-A-young-male-protagonist-with-a-determined-expression-wielding-two-sleek-handguns-in-a-battle-ready-stance.-He-wears-a-dark-jacket-with-red-or-silver.webp",
-        "Crossing the Two Realms: From a Trader to an Immortal Emperor":
-            "https://dragonholic.com/wp-content/uploads/2025/03/book_177955.jpg",
-        "Commoner Queen: Falling in Love with His Royal Highness the Crown Prince":
-            "https://dragonholic.com/wp-content/uploads/2025/03/22136_enhanced.jpg",
-        "\"On the Day of Reunion, The Heir to the Wealthy Family Became My Brother\"":
-            "https://dragonholic.com/wp-content/uploads/2025/03/On-the-day-of-the-reunion.jpg",
-        "Sweet Kiss":
-            "https://dragonholic.com/wp-content/uploads/2025/03/book_177723.jpg",
-        "It Was A Fake Marriage, But Jiu Qian Sui Took It Seriously":
-            "https://dragonholic.com/wp-content/uploads/2025/03/Novel-4.jpg",
-        "Dare to Cancel the Engagement? I Will Marry Your Ancestor!":
-            "https://dragonholic.com/wp-content/uploads/2025/02/chinese.jpg",
-        "Banishment is Fine: As a Genius Saint, I Can Shine Anywhere.":
-            "https://dragonholic.com/wp-content/uploads/2025/02/DALL·E-2025-02-27-21.57.04-A-confident-and-elegant-young-saint-with-golden-hair-and-piercing-blue-eyes-dressed-in-a-flowing-white-robe-standing-proudly-in-front-of-a-grand-tem.webp",
-        "The Necromance of Love and Death: Defeated Early in the Game, I Reincarnated as a Tragic Villainous Noble and Rebel Against the Scenario with My Beloved Using My Modern and Game Knowledge":
-            "https://dragonholic.com/wp-content/uploads/2025/02/DALL·E-2025-02-20-19.23.11-A-romantic-yet-eerie-scene-featuring-a-noble-protagonist-and-their-beloved-standing-close-together-in-a-gothic-moonlit-graveyard.-The-protagonist-ha.webp",
-        "Little Fish and Mint":
-            "https://dragonholic.com/wp-content/uploads/2025/05/20241127034846_300_420.jpg",
-        "Accidentally Marked My Ex’s Crush, the Ice-Cold Goddess O":
-            "https://dragonholic.com/wp-content/uploads/2025/08/Accidentally-Marked-My-Exs-Crush-the-Ice-Cold-Goddess-O.png",
-        "After Becoming the Abused Heroine in a Campus Story":
-            "https://dragonholic.com/wp-content/uploads/2025/05/After-Going-on-a-Blind-Date-With-My-Omega-Love-Rival.jpg",
-        "After Going on a Blind Date With My Omega Love Rival":
-            "https://dragonholic.com/wp-content/uploads/2025/05/After-Going-on-a-Blind-Date-With-My-Omega-Love-Rival.jpg",
-        "After the Top Idol Omega and I Started Living Together":
-            "https://dragonholic.com/wp-content/uploads/2025/07/After-the-Top-Idol-Omega-and-I-Started-Living-Together.jpg",
-        "After Transmigrating Into a Book, I Was Forced to Play the Role of a Scumbag Alpha (GL)":
-            "https://dragonholic.com/wp-content/uploads/2025/06/After-Transmigrating-Into-a-Book-I-Was-Forced-to-Play-the-Role-of-a-Scumbag-Alpha-GL.jpg",
-        "Dressed as the Scumbag Alpha Mom of the Tragic Female Lead":
-            "https://dragonholic.com/wp-content/uploads/2025/05/Dressed-as-the-Scumbag-Alpha-Mom-of-the-Tragic-Female-Lead.jpg",
-        "Failed to Pretend to Be an Alpha and Got Marked by the Enemy":
-            "https://dragonholic.com/wp-content/uploads/2025/05/Failed-to-Pretend-to-Be-an-Alpha-and-Got-Marked-by-My-Archenemy.jpg",
-        "The Little Bookworm Marked Her Ex-aunt":
-            "https://dragonholic.com/wp-content/uploads/2025/07/The-Little-Bookworm-Marked-Her-Ex-aunt.png",
-        "Transmigrated as a Cannon Fodder Wife A in Ancient Times":
-            "https://dragonholic.com/wp-content/uploads/2025/05/Transmigrated-as-a-Cannon-Fodder-Wife-A-in-Ancient-Times.jpg",
-        "Transmigrated Into an Ancient Famine Novel as a Scumbag Alpha (ABO, GL)":
-            "https://dragonholic.com/wp-content/uploads/2025/05/Transmigrated-Into-an-Ancient-Famine-Novel-as-a-Scumbag-Alpha-ABO-GL.png",
-        "Within The Sound of Swallows":
-            "https://dragonholic.com/wp-content/uploads/2025/05/WTSOS.jpg",
-        "A Hundred Of Beautiful Lives":
-            "https://dragonholic.com/wp-content/uploads/2025/04/392289038-256-k740149.jpg",
-        "Sylvie, the Slave Girl (Lily Futa)":
-            "https://dragonholic.com/wp-content/uploads/2025/05/sylvie.jpg",
-        "New Normal":
-            "https://dragonholic.com/wp-content/uploads/2025/07/IMG_0632.webp",
-        "Mudoo":
-            "https://dragonholic.com/wp-content/uploads/2025/07/IMG_0773.jpeg",
-        "Small and Fragile Things":
-            "https://dragonholic.com/wp-content/uploads/2025/07/IMG_0771.jpeg",
-        "Defective Banana":
-            "https://dragonholic.com/wp-content/uploads/2025/07/IMG_1209.jpeg",
-        "Breaking the Taboo (1v2, Blood Uncle and Nephew)":
-            "https://dragonholic.com/wp-content/uploads/2025/09/O20241029002934.jpg",
-        "The Vicious Supporting Villainess’s Chronicle of Serving Pleasure (Historical 1v1, H)":
-            "https://dragonholic.com/wp-content/uploads/2025/09/GPT_Image_1_Chinese_historical_romance_novel_cover_Title_Style_0.png",
-        "Strategy to Conquer the Vicious Female Supporting Character [Quick Transmigration]":
-            "https://dragonholic.com/wp-content/uploads/2025/09/STCTVFSC-QT-novel-pic.png"
-    }
-    
-    for key, url in featured_image_map.items():
-        if key in title:
-            return url
-    return ""
-    
+    return _FEATURED_IMAGE_INDEX.lookup(title, "")
+
 def get_discord_role_id(translator):
     """
     Returns the Discord role ID for the given translator.
@@ -453,45 +257,41 @@ def get_discord_role_id(translator):
     """
     return DISCORD_ROLE_ID_MAP.get(translator, "")
 
-def slugify(text: str) -> str: #no longer used, only for ref. Moved to paid generator.
-    text = text.lower().strip()
-    text = re.sub(r"[^\w\s\u0080-\uFFFF-]", "", text)
-    text = re.sub(r"[\s_]+", "-", text)
-    return re.sub(r"-{2,}", "-", text)
-
-# URL overrides for novels – fill in the correct URL for each novel as needed.
-NOVEL_URL_OVERRIDES = {
-    "Help others? It’s better to help yourself": "https://dragonholic.com/novel/helping-others-its-better-to-help-yourself/",
-    "Rebirth of the Excellent Daughter of the Marquis Household (REDMH)": "https://dragonholic.com/novel/redmh/",
-    "The Eldest Legitimate Daughter is Both Beautiful and Valiant (ELDBBV)": "https://dragonholic.com/novel/eldbbv/",
-    "Transmigrated into the Villain's Cannon Fodder Ex-Wife (Transmigrated into a Book)": "https://dragonholic.com/novel/transmigrated-as-the-villains-cannon-fodder-ex-wife/",
-    "When I started High School, My Childhood Friend, who had suddenly become distant and cold, was harassed by a stranger. I stepped in to help, and as a result, from the following day, My Childhood Friend's behavior became unusual.": "https://dragonholic.com/novel/when-i-started-high-school-my-childhood-friend-who-had-suddenly-become-distant-and-cold-was-harassed-by-a-stranger-i-stepped-in-to-help-and-as-a-result-from-the-following-day-my-childhood-frien/",
-    "The Female Lead is Looking at Me Differently (GL)": "https://dragonholic.com/novel/the-female-lead-is-looking-at-me-differently/",
-    "A Moment Too Late (GL)": "https://dragonholic.com/novel/gl-a-moment-too-late/",
-    "After Marrying the Disabled Prince (BG)": "https://dragonholic.com/novel/after-marrying-the-disabled-prince/",
-    "The Strongest Delivery Man": "https://dragonholic.com/novel/the-strongest-delivery-guy/",
-    "The Necromance of Love and Death: Defeated Early in the Game, I Reincarnated as a Tragic Villainous Noble and Rebel Against the Scenario with My Beloved Using My Modern and Game Knowledge": "https://dragonholic.com/novel/the-necromance-of-love-and-death-reincarnated-as-a-tragic-villainous-aristocrat-defeated-early-in-the-game-i-rebel-against-the-scenario-with-my-beloved-modern-knowledge-and-game-knowledge/",
-    "I’m the Eldest Son of a Poor Family, but My Magical Talent Awakened While Working Hard for My Family": "https://dragonholic.com/novel/im-the-eldest-son-of-a-poor-family-but-my-magical-talent-awakened-while-working-hard-for-my-family/"
-}
-    
+# no longer used here, only for ref. Moved to dh_text.
+slugify = slug
+
+def get_novel_url(title: str) -> str:
+    """
+    Main page URL of a novel: its NOVEL_URL_OVERRIDES entry, or the slug
+    of its title. Precomputed for every mapped title.
+    """
+    url = _NOVEL_URLS.get(title)
+    if url is None:
+        url = NOVEL_URL_OVERRIDES.get(title) or f"{NOVEL_BASE_URL}{slug(title)}/"
+    return url
+
 def get_nsfw_novels():
     """
-    Returns a list of NSFW novel titles
+    Returns the set of NSFW novel titles
     """
-    return [
-        "Bondage and Marriage",
-        "Clap",
-        "Double Junk",
-        "My Bloody Valentine",
-        "Reasonable Loss",
-        "Red Dot",
-        "The Tyrant's Happy Ending",
-        "A Forest flowing with Milk and Honey",
-        "Zion's Garden",
-        "Diary of my Ex",
-        "The Three baby mining brothers",
-        "Little Blind Girl",
-        "The Young Marquis Regrets Too Late",
-        "Wicked Island Of Ireland"
-        "Sylvie, the Slave Girl (Lily Futa)"
-    ]
+    return NSFW_NOVELS
+
+
+_NOVEL_META = {title: NovelMeta(*meta) for title, meta in _MAPPINGS["novel_meta"].items()}
+
+def get_novel_meta(title: str) -> NovelMeta:
+    """
+    The NovelMeta for title, computed on first use and memoised for the
+    rest of the process (mapped titles come precomputed). Unmapped titles
+    get an empty translator.
+    """
+    meta = _NOVEL_META.get(title)
+    if meta is None:
+        translator = get_translator(title) or ""
+        category = "NSFW" if title in NSFW_NOVELS else "SFW"
+        role = get_discord_role_id(translator)
+        if category == "NSFW":
+            role += " " + NSFW_ROLE_ID
+        meta = _NOVEL_META[title] = NovelMeta(translator, role, category, get_featured_image(title))
+    return meta
+
@@ -0,0 +1,144 @@
+# dh_metrics.py
+#
+# Lightweight run instrumentation shared by the generators and
+# check_paid_all: wall time per stage, every fetch (URL, status, latency,
+# bytes), and named counters for items produced / skipped and cache hits.
+# At the end of a run the entry point writes a JSON report and, when
+# DH_METRICS_PROM is set, a Prometheus textfile-collector file.
+
+import os
+import json
+import math
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from dh_xml_writer import atomic_open
+
+# Where the run report goes; set DH_METRICS_REPORT="" to skip it.
+METRICS_REPORT_PATH = os.environ.get("DH_METRICS_REPORT", "dh_run_report.json")
+# Prometheus textfile (e.g. /var/lib/node_exporter/textfile/dh.prom); off by default.
+METRICS_PROM_PATH = os.environ.get("DH_METRICS_PROM", "")
+
+
+def percentile(sorted_values, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class RunMetrics:
+    """
+    Collects one run's measurements. Stages that run several times (e.g.
+    once per novel) accumulate; with concurrent tasks a stage's total can
+    therefore exceed the run's wall time.
+
+        with metrics.stage("paid.serialize"):
+            ...
+        metrics.incr("paid.items_written", len(items))
+        metrics.write_outputs()
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.started = time.time()
+        self._t0 = time.perf_counter()
+        self.stages = {}
+        self.fetches = []
+        self.counters = Counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - t0
+
+    def incr(self, name: str, n: int = 1):
+        self.counters[name] += n
+
+    def record_fetch(self, url: str, status: int, seconds: float, nbytes: int = 0, attempts: int = 1,
+                     queued: float = 0.0):
+        """seconds is time spent on requests; queued, time spent waiting to be allowed to send them."""
+        self.fetches.append({
+            "url":      url,
+            "status":   status,
+            "seconds":  round(seconds, 4),
+            "queued":   round(queued, 4),
+            "bytes":    nbytes,
+            "attempts": attempts,
+        })
+
+    def report(self) -> dict:
+        latencies = sorted(f["seconds"] for f in self.fetches)
+        queued = sorted(f["queued"] for f in self.fetches)
+        statuses = Counter(str(f["status"]) for f in self.fetches)
+        return {
+            "started":  time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.started)),
+            "duration": round(time.perf_counter() - self._t0, 4),
+            "stages":   {name: round(secs, 4) for name, secs in sorted(self.stages.items())},
+            "counters": dict(sorted(self.counters.items())),
+            "fetch": {
+                "requests":    len(self.fetches),
+                "by_status":   dict(sorted(statuses.items())),
+                "bytes":       sum(f["bytes"] for f in self.fetches),
+                "cache_hits":  statuses.get("304", 0),
+                "latency_p50": percentile(latencies, 50),
+                "latency_p90": percentile(latencies, 90),
+                "latency_p99": percentile(latencies, 99),
+                "queued_p50":  percentile(queued, 50),
+                "queued_p90":  percentile(queued, 90),
+                "queued_p99":  percentile(queued, 99),
+            },
+            "fetches":  self.fetches,
+        }
+
+    def prometheus(self) -> str:
+        """The report as Prometheus text exposition format."""
+        r = self.report()
+        lines = []
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{labels} {value}")
+        label = lambda key, value: '{%s="%s"}' % (key, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+
+        metric("dh_run_timestamp_seconds", "gauge", "Start time of the last run.",
+               [("", int(self.started))])
+        metric("dh_run_duration_seconds", "gauge", "Wall time of the last run.",
+               [("", r["duration"])])
+        metric("dh_stage_seconds", "gauge", "Time spent per pipeline stage in the last run.",
+               [(label("stage", k), v) for k, v in r["stages"].items()])
+        metric("dh_fetch_requests", "gauge", "HTTP fetches in the last run by final status.",
+               [(label("status", k), v) for k, v in r["fetch"]["by_status"].items()])
+        metric("dh_fetch_bytes", "gauge", "Response bytes downloaded in the last run.",
+               [("", r["fetch"]["bytes"])])
+        metric("dh_fetch_latency_seconds", "gauge", "Fetch latency percentiles in the last run.",
+               [(label("quantile", q / 100), r["fetch"][f"latency_p{q}"]) for q in (50, 90, 99)])
+        metric("dh_fetch_queued_seconds", "gauge",
+               "Percentiles of the wait for a connection slot and rate-limit token in the last run.",
+               [(label("quantile", q / 100), r["fetch"][f"queued_p{q}"]) for q in (50, 90, 99)])
+        metric("dh_items", "gauge", "Item and cache counters from the last run.",
+               [(label("counter", k), v) for k, v in r["counters"].items()])
+        return "\n".join(lines) + "\n"
+
+    def write_outputs(self, report_path: str = None, prom_path: str = None):
+        """Write the JSON report and the Prometheus file to their configured paths."""
+        report_path = METRICS_REPORT_PATH if report_path is None else report_path
+        prom_path = METRICS_PROM_PATH if prom_path is None else prom_path
+        if report_path:
+            with atomic_open(report_path) as f:
+                json.dump(self.report(), f, ensure_ascii=False, indent=2)
+        if prom_path:
+            with atomic_open(prom_path) as f:
+                f.write(self.prometheus())
+
+
+# The process-wide collector every module records into.
+metrics = RunMetrics()
@@ -0,0 +1,58 @@
+# dh_order.py
+#
+# The ordering stage both generators end with. Without a cap it is one
+# stable newest-first sort. With an item-count or age cap, items are split
+# into per-novel streams, each a short and usually already ordered
+# newest-first run; a heap k-way merges them into one newest-first feed and
+# stops as soon as the cap is reached, so only the items that get
+# published are materialised.
+
+import os
+import heapq
+import datetime
+import itertools
+
+# Caps on what a feed publishes; 0 = no cap. The age is in seconds.
+FEED_MAX_ITEMS = int(os.environ.get("DH_FEED_MAX_ITEMS", "0"))
+FEED_MAX_AGE = float(os.environ.get("DH_FEED_MAX_AGE", "0"))
+
+
+def age_cutoff(now: datetime.datetime, max_age: float = None):
+    """Oldest publish date the age cap still lets through, or None without one."""
+    max_age = FEED_MAX_AGE if max_age is None else max_age
+    return now - datetime.timedelta(seconds=max_age) if max_age > 0 else None
+
+def newest_first(items, stream_of, key, limit: int = None, since: datetime.datetime = None,
+                 date_of=None) -> list:
+    """
+    items in the order of a stable newest-first sort on key. Stops after
+    limit items (default FEED_MAX_ITEMS; 0 = no cap) or at the first item
+    with date_of(item) older than since, which key must lead with.
+
+    Without either cap that is exactly one sorted() call. With one, items
+    are split into one stream per stream_of(item); each item's key is
+    computed exactly once, each stream is sorted on its own (short,
+    usually already ordered runs) and the streams are heap merged, which
+    can stop early. Equal keys across streams come out in stream order, so
+    items of one stream should be contiguous or key should tell streams
+    apart.
+    """
+    limit = FEED_MAX_ITEMS if limit is None else limit
+    if limit <= 0 and since is None:
+        # nothing can stop a merge early, and one sort beats it
+        return sorted(items, key=key, reverse=True)
+    streams = {}
+    for seq, item in enumerate(items):
+        # -seq: equal keys keep their input order under reverse=True
+        streams.setdefault(stream_of(item), []).append((key(item), -seq, item))
+    for stream in streams.values():
+        stream.sort(reverse=True)
+    merged = (item for _, _, item in heapq.merge(*streams.values(), reverse=True))
+    return _capped(merged, limit, since, date_of)
+
+def _capped(merged, limit, since, date_of) -> list:
+    if since is not None:
+        merged = itertools.takewhile(lambda item: date_of(item) >= since, merged)
+    if limit > 0:
+        merged = itertools.islice(merged, limit)
+    return list(merged)
@@ -1,51 +1,38 @@
 #!/usr/bin/env python3
-import re
+import os
+import sys
+import hashlib
 import datetime
 import asyncio
-import aiohttp
-import feedparser
+import argparse
+from operator import attrgetter
 from bs4 import BeautifulSoup
-import PyRSS2Gen
-import xml.dom.minidom
-from xml.sax.saxutils import escape
 from urllib.parse import quote
 
 from dh_mappings import (
     TRANSLATOR_NOVEL_MAP,
-    NOVEL_URL_OVERRIDES,
-    get_featured_image,
-    get_translator,
-    get_discord_role_id,
-    get_nsfw_novels
+    get_novel_meta,
+    get_novel_url as mapped_novel_url
 )
-
-semaphore = asyncio.Semaphore(100)
+from dh_http import FetchScheduler, ValidatorCache
+from dh_cadence import CadenceTracker
+from dh_store import ChapterStore
+from dh_metrics import metrics
+from dh_feed_reader import load_feed_chapters, item_key
+from dh_html import ParsePool, make_novel_soup, novel_page_digest
+from dh_rss import Chapter, EXIT_UNCHANGED, chapter_fingerprint, write_feed_file
+from dh_order import age_cutoff, newest_first
+from dh_dates import resolver_at
+from dh_text import slug, chapter_num, collapse_whitespace, first_number, split_chapter_link
 
 def get_novel_url(title: str) -> str:
     """
     Returns the main page URL for the given novel title.
     Uses NOVEL_URL_OVERRIDES if present, otherwise
     slugs via our unified slug() (keeps ☆④, collapses ASCII punctuation).
+    Precomputed for every mapped title by dh_mappings.
     """
-    override = NOVEL_URL_OVERRIDES.get(title)
-    if override:
-        return override
-    return f"https://dragonholic.com/novel/{slug(title)}/"
-
-def slug(text: str) -> str:
-    # 1) lowercase + trim
-    s = text.lower().strip()
-
-    # 2) remove ASCII punctuation but keep non‑ASCII, word chars, whitespace & hyphens
-    s = re.sub(r"[^\w\s\u0080-\uFFFF-]", "", s)
-
-    # 3) collapse whitespace/underscores into single hyphens
-    s = re.sub(r"[\s_]+", "-", s)
-
-    # 4) collapse any multiple hyphens into one
-    s = re.sub(r"-{2,}", "-", s)
-
-    return s
+    return mapped_novel_url(title)
 
 def split_title(full_title: str):
     parts = full_title.split(" - ", 1)
@@ -53,319 +40,499 @@ def split_title(full_title: str):
         return parts[0].strip(), parts[1].strip()
     return full_title.strip(), ""
 
-async def fetch_page(session, url: str) -> str:
-    """Fetch a page; on non-200 or exception, log & return empty string."""
-    try:
-        async with session.get(url) as resp:
-            if resp.status != 200:
-                print(f"⚠️  Warning: {url} returned HTTP {resp.status}")
-                return ""
-            return await resp.text()
-    except Exception as e:
-        print(f"⚠️  Error fetching {url}: {e}")
-        return ""
-
 def clean_description(raw_desc: str) -> str:
     soup = BeautifulSoup(raw_desc, "html.parser")
     for div in soup.select("div.c-content-readmore"):
         div.decompose()
     cleaned = soup.decode_contents()
-    return re.sub(r'\s+', ' ', cleaned).strip()
+    return collapse_whitespace(cleaned)
 
-def extract_pubdate_from_soup(chap) -> datetime.datetime:
+def release_date_text(chap):
+    """The raw release-date text of a chapter <li>, or None when it has none."""
     span = chap.select_one("span.chapter-release-date i")
-    if not span:
-        return datetime.datetime.now(datetime.timezone.utc)
-    date_str = span.get_text(strip=True)
-    try:
-        # absolute date
-        return datetime.datetime.strptime(date_str, "%B %d, %Y")\
-                .replace(tzinfo=datetime.timezone.utc)
-    except:
-        # relative
-        now = datetime.datetime.now(datetime.timezone.utc)
-        parts = date_str.lower().split()
-        if parts and parts[0].isdigit():
-            num = int(parts[0]); unit = parts[1]
-            if "minute" in unit: return now - datetime.timedelta(minutes=num)
-            if "hour"   in unit: return now - datetime.timedelta(hours=num)
-            if "day"    in unit: return now - datetime.timedelta(days=num)
-            if "week"   in unit: return now - datetime.timedelta(weeks=num)
-    return now
-
-def chapter_num(chaptername: str):
-    nums = re.findall(r'\d+(?:\.\d+)?', chaptername)
-    return tuple(float(n) if '.' in n else int(n) for n in nums) if nums else (0,)
+    return span.get_text(strip=True) if span else None
+
+def extract_pubdate_from_soup(chap, now: datetime.datetime = None) -> datetime.datetime:
+    return pubdate_from_text(release_date_text(chap), now)
+
+def pubdate_from_text(date_str, now: datetime.datetime = None) -> datetime.datetime:
+    """
+    Release date text → aware datetime. Relative dates ("3 hours ago") are
+    anchored to now, the run's clock (default: the current time), so
+    resolving them again in a later run re-anchors them; no text at all
+    means now. See dh_dates.
+    """
+    return resolver_at(now).resolve(date_str)
 
 def normalize_date(dt: datetime.datetime) -> datetime.datetime:
     return dt.replace(microsecond=0)
 
-async def scrape_paid_chapters_async(session, base_url: str):
+# paid chapters older than this drop out of the feed
+PAID_WINDOW = datetime.timedelta(days=7)
+
+def paid_cutoff(now: datetime.datetime = None) -> datetime.datetime:
+    return (now or datetime.datetime.now(datetime.timezone.utc)) - PAID_WINDOW
+
+PAID_FEED_PATH = "dh_paid_feed.xml"
+
+def shard_of(title: str, shards: int) -> int:
     """
-    Fetch & parse the paid chapters from a novel page.
-    Returns (list_of_dicts, main_description).
+    Shard (0 … shards-1) a novel belongs to. A hash of the title alone,
+    stable across processes and machines, so every job agrees on the split.
     """
-    html = await fetch_page(session, base_url)
-    if not html:
-        return [], ""
-    soup = BeautifulSoup(html, "html.parser")
+    digest = hashlib.blake2b(title.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shards
+
+def shard_path(index: int, shards: int) -> str:
+    """The partial item file shard index of shards writes."""
+    return f"dh_paid_feed.shard-{index}-of-{shards}.xml"
+
+def parse_shard(text: str) -> tuple:
+    """"I/N" → (I, N), with 0 <= I < N; for argparse."""
+    try:
+        index, shards = (int(part) for part in text.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected I/N, got {text!r}")
+    if not 0 <= index < shards:
+        raise argparse.ArgumentTypeError(f"shard index must be in 0..{shards - 1}, got {index}")
+    return index, shards
+
+def parse_shard_count(text: str) -> int:
+    """"N" → N >= 1; for argparse."""
+    try:
+        shards = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a shard count, got {text!r}")
+    if shards < 1:
+        raise argparse.ArgumentTypeError(f"shard count must be at least 1, got {shards}")
+    return shards
+
+def _parse_chapter_li(chap_li, base_url: str, vol_display: str, pub_dt: datetime.datetime,
+                      description: str) -> Chapter:
+    """
+    Turn one paid <li class="wp-manga-chapter"> into a Chapter (without
+    the novel title). Link fallback is built from the volume label when
+    there is one.
+    """
+    a = chap_li.find("a")
+    chap_name, nameext = split_chapter_link(a.decode_contents())
+    chap_id = first_number(chap_name)
+    href = a.get("href","").strip()
+    if href and href != "#":
+        link = href
+    elif vol_display:
+        # vol_display is e.g. "1 - Chalize is Dead", chap_name is e.g. "9 - The Puppet King, Henry"
+        link = f"{base_url}{slug(vol_display)}/{slug(chap_name)}/"
+    else:
+        link = f"{base_url}{slug(chap_name)}/"
+
+    guid = next((c.split("data-chapter-")[1]
+                 for c in chap_li.get("class",[])
+                 if c.startswith("data-chapter-")), chap_id)
+    coin_span = chap_li.select_one("span.coin")
+    coin = coin_span.get_text(strip=True) if coin_span else ""
+
+    return Chapter(
+        volume=      vol_display,
+        chaptername= chap_name,
+        nameextend=  nameext,
+        link=        link,
+        description= description,
+        pubDate=     pub_dt,
+        guid=        guid,
+        coin=        coin
+    )
+
+def parse_paid_chapters(html: str, base_url: str, since: datetime.datetime = None,
+                        now: datetime.datetime = None):
+    """
+    Parse an already-downloaded novel page exactly once.
+    Returns (list_of_chapters, main_description) for paid chapters
+    released at or after since (default: the 7 days before now).
+    Relative release dates are anchored to now (default: the current time).
+    """
+    paid, main_desc, _ = _parse_paid_page(html, base_url, since, now)
+    return paid, main_desc
+
+def _parse_paid_page(html: str, base_url: str, since: datetime.datetime = None,
+                     now: datetime.datetime = None):
+    """parse_paid_chapters, plus each chapter's raw release-date text."""
+    dates = resolver_at(now)
+    soup = make_novel_soup(html)
 
     # description
     desc_div = soup.select_one("div.description-summary")
     main_desc = clean_description(desc_div.decode_contents()) if desc_div else ""
 
-    paid = []
-    now = datetime.datetime.now(datetime.timezone.utc)
+    # (volume label, <li>) pairs from either page layout
+    chap_lis = []
 
     # volume‐based
     vol_ul = soup.select_one("ul.main.version-chap.volumns")
     if vol_ul:
         for vol_parent in vol_ul.select("li.parent.has-child"):
             # full dropdown text, e.g. "1 - Chalize is Dead"
-            vol_label    = vol_parent.select_one("a.has-child").get_text(strip=True)
-            vol_display  = vol_label
-            # numeric part for URL fallback
-            vol_id       = vol_label.split(" - ",1)[0].strip()
-
+            vol_display = vol_parent.select_one("a.has-child").get_text(strip=True)
             for chap_li in vol_parent.select("ul.sub-chap-list li.wp-manga-chapter"):
-                if "free-chap" in chap_li.get("class", []):
-                    continue
-                pub_dt = extract_pubdate_from_soup(chap_li)
-                if pub_dt < now - datetime.timedelta(days=7):
-                    continue
-
-                a = chap_li.find("a")
-                # simple split on the first " - " in the link text:
-                raw_html = a.decode_contents()
-                
-                # 1) chaptername is everything before the first tag (<)
-                m1 = re.match(r'\s*([^<]+)', raw_html)
-                chap_name = m1.group(1).strip() if m1 else raw_html.strip()
-                
-                # 2) nameextend is whatever follows </i> – …  (drop only that first dash)
-                m2 = re.search(r'</i>\s*[-–]\s*(.+)', raw_html)
-                nameext = m2.group(1).strip() if m2 else ""
-                num_m = re.search(r"(\d+(?:\.\d+)?)", chap_name)
-                chap_id = num_m.group(1) if num_m else ""
-                href = a.get("href","").strip()
-                if href and href != "#":
-                    link = href
-                else:
-                    # vol_display is e.g. "1 - Chalize is Dead", chap_name is e.g. "9 - The Puppet King, Henry"
-                    link = f"{base_url}{slug(vol_display)}/{slug(chap_name)}/"
-
-                guid = next((c.split("data-chapter-")[1]
-                             for c in chap_li.get("class",[])
-                             if c.startswith("data-chapter-")), chap_id)
-                coin = chap_li.select_one("span.coin").get_text(strip=True) \
-                       if chap_li.select_one("span.coin") else ""
-
-                paid.append({
-                    "volume":      vol_display,
-                    "chaptername": chap_name,
-                    "nameextend":  nameext,
-                    "link":        link,
-                    "description": main_desc,
-                    "pubDate":     pub_dt,
-                    "guid":        guid,
-                    "coin":        coin
-                })
+                chap_lis.append((vol_display, chap_li))
 
     # no‐volume
     no_vol_ul = soup.select_one("ul.main.version-chap.no-volumn")
     if no_vol_ul:
         for chap_li in no_vol_ul.select("li.wp-manga-chapter"):
-            if "free-chap" in chap_li.get("class", []):
-                continue
-            pub_dt = extract_pubdate_from_soup(chap_li)
-            if pub_dt < now - datetime.timedelta(days=7):
-                continue
-
-            a = chap_li.find("a")
-            # simple split on the first " - " in the link text:
-            raw_html = a.decode_contents()
-            
-            # 1) chaptername is everything before the first tag (<)
-            m1 = re.match(r'\s*([^<]+)', raw_html)
-            chap_name = m1.group(1).strip() if m1 else raw_html.strip()
-            
-            # 2) nameextend is whatever follows </i> – …  (drop only that first dash)
-            m2 = re.search(r'</i>\s*[-–]\s*(.+)', raw_html)
-            nameext = m2.group(1).strip() if m2 else ""
-            num_m = re.search(r"(\d+(?:\.\d+)?)", chap_name)
-            chap_id = num_m.group(1) if num_m else ""
-            href = a.get("href","").strip()
-            if href and href != "#":
-                link = href
-            else:
-                link = f"{base_url}{slug(chap_name)}/"
-
-            guid = next((c.split("data-chapter-")[1]
-                         for c in chap_li.get("class",[])
-                         if c.startswith("data-chapter-")), chap_id)
-            coin = chap_li.select_one("span.coin").get_text(strip=True) \
-                   if chap_li.select_one("span.coin") else ""
-
-            paid.append({
-                "volume":      "",
-                "chaptername": chap_name,
-                "nameextend":  nameext,
-                "link":        link,
-                "description": main_desc,
-                "pubDate":     pub_dt,
-                "guid":        guid,
-                "coin":        coin
-            })
-
-    return paid, main_desc
-
-class MyRSSItem(PyRSS2Gen.RSSItem):
-    def __init__(self, *args, volume="", chaptername="", nameextend="", coin="", **kwargs):
-        self.volume      = volume
-        self.chaptername = chaptername
-        self.nameextend  = nameextend
-        self.coin        = coin
-        super().__init__(*args, **kwargs)
-
-    def writexml(self, writer, indent="", addindent="", newl=""):
-        w = writer.write
-        w(f"{indent}  <item>{newl}")
-        w(f"{indent}    <title>{escape(self.title)}</title>{newl}")
-        w(f"{indent}    <volume>{escape(self.volume)}</volume>{newl}")
-        w(f"{indent}    <chaptername>{escape(self.chaptername)}</chaptername>{newl}")
-        ext = f"***{self.nameextend}***" if self.nameextend.strip() else ""
-        w(f"{indent}    <nameextend>{escape(ext)}</nameextend>{newl}")
-        w(f"{indent}    <link>{escape(self.link)}</link>{newl}")
-        w(f"{indent}    <description><![CDATA[{self.description}]]></description>{newl}")
-        cat = "NSFW" if self.title in get_nsfw_novels() else "SFW"
-        w(f"{indent}    <category>{escape(cat)}</category>{newl}")
-        trans = get_translator(self.title) or ""
-        w(f"{indent}    <translator>{escape(trans)}</translator>{newl}")
-        role = get_discord_role_id(trans)
-        if cat=="NSFW": role += " <@&1304077473998442506>"
-        w(f"{indent}    <discord_role_id><![CDATA[{role}]]></discord_role_id>{newl}")
-        w(f"{indent}    <featuredImage url=\"{escape(get_featured_image(self.title))}\"/>{newl}")
-        if self.coin:
-            w(f"{indent}    <coin>{escape(self.coin)}</coin>{newl}")
-        w(f"{indent}    <pubDate>{self.pubDate.strftime('%a, %d %b %Y %H:%M:%S +0000')}</pubDate>{newl}")
-        w(f"{indent}    <guid isPermaLink=\"false\">{escape(self.guid.guid)}</guid>{newl}")
-        w(f"{indent}  </item>{newl}")
-
-class CustomRSS2(PyRSS2Gen.RSS2):
-    def writexml(self, writer, indent="", addindent="", newl=""):
-        w = writer.write
-        w(f'<?xml version="1.0" encoding="utf-8"?>{newl}')
-        w('<rss xmlns:content="http://purl.org/rss/1.0/modules/content/" '
-          'xmlns:wfw="http://wellformedweb.org/CommentAPI/" '
-          'xmlns:dc="http://purl.org/dc/elements/1.1/" '
-          'xmlns:atom="http://www.w3.org/2005/Atom" '
-          'xmlns:sy="http://purl.org/rss/1.0/modules/syndication/" '
-          'xmlns:slash="http://purl.org/rss/1.0/modules/slash/" '
-          'xmlns:webfeeds="http://www.webfeeds.org/rss/1.0" '
-          'xmlns:georss="http://www.georss.org/georss" '
-          'xmlns:geo="http://www.w3.org/2003/01/geo/wgs84_pos#" '
-          'version="2.0">' + newl)
-        w(indent + "<channel>" + newl)
-        for tag in ("title","link","description","language","lastBuildDate","docs","generator","ttl"):
-            val = getattr(self, tag, None)
-            if val:
-                if tag=="lastBuildDate":
-                    val = val.strftime("%a, %d %b %Y %H:%M:%S +0000")
-                w(f"{indent}{addindent}<{tag}>{escape(str(val))}</{tag}>{newl}")
-        for item in self.items:
-            item.writexml(writer, indent+addindent, addindent, newl)
-        w(indent + "</channel>" + newl)
-        w("</rss>" + newl)
-
-async def process_novel(session, title: str):
+            chap_lis.append(("", chap_li))
+
+    paid, date_texts = [], []
+    cutoff = paid_cutoff(dates.now) if since is None else since
+    for vol_display, chap_li in chap_lis:
+        if "free-chap" in chap_li.get("class", []):
+            continue
+        date_text = release_date_text(chap_li)
+        pub_dt = dates.resolve(date_text)
+        if pub_dt < cutoff:
+            continue
+        paid.append(_parse_chapter_li(chap_li, base_url, vol_display, pub_dt, main_desc))
+        date_texts.append(date_text)
+
+    return paid, main_desc, date_texts
+
+# fields a cached chapter keeps; title and meta are filled in per novel
+_CACHED_FIELDS = ("volume", "chaptername", "nameextend", "link", "description", "guid", "coin")
+
+def _chapters_to_cache(chapters, date_texts):
+    return [dict({f: getattr(chap, f) for f in _CACHED_FIELDS},
+                 pubDate=chap.pubDate.isoformat(), date=date_text)
+            for chap, date_text in zip(chapters, date_texts)]
+
+def _chapters_from_cache(cached, now: datetime.datetime = None):
+    """
+    Rebuild Chapters from a cached result, re-anchoring relative release
+    dates to now (as a fresh parse would) and dropping anything that has
+    aged out of the 7-day window since it was stored.
+    """
+    dates = resolver_at(now)
+    cutoff = paid_cutoff(dates.now)
+    chapters = []
+    for chap in cached:
+        if "date" in chap:
+            pub_dt = dates.resolve(chap["date"])
+        else:
+            pub_dt = datetime.datetime.fromisoformat(chap["pubDate"])
+        if pub_dt < cutoff:
+            continue
+        chapters.append(Chapter(pubDate=pub_dt, **{f: chap.get(f, "") for f in _CACHED_FIELDS}))
+    return chapters
+
+async def scrape_paid_chapters_async(fetcher, base_url: str, cache: ValidatorCache = None,
+                                     pool: ParsePool = None, now: datetime.datetime = None):
+    """
+    Fetch & parse the paid chapters from a novel page.
+    One HTTP request and at most one parse per call. With a cache, a 304
+    reuses the stored chapter list without parsing at all, and so does a
+    200 whose chapter-list regions hash the same as last time (the page
+    only rotated nonces, ads or scripts). With a pool the parse runs in a
+    worker process instead of on the event loop. Relative release dates
+    are anchored to now, the run's clock (default: the current time).
+    Returns (list_of_chapters, main_description, changed), where changed is
+    False when the stored list was reused, or (None, "", False) when the
+    page could not be fetched at all.
+    """
+    resp = await fetcher.fetch(base_url, cache)
+    cached = cache.lookup(base_url) if cache is not None else None
+    if resp.status == 304:
+        metrics.incr("paid.pages_not_modified")
+        return _chapters_from_cache(cached["chapters"], now), cached["description"], False
+    if not resp.text:
+        return None, "", False
+    with metrics.stage("paid.digest"):
+        digest = novel_page_digest(resp.text)
+    if digest is not None and cached and cached.get("digest") == digest:
+        metrics.incr("paid.pages_unchanged")
+        cache.store(base_url, resp.etag, resp.last_modified, cached)
+        return _chapters_from_cache(cached["chapters"], now), cached["description"], False
+    with metrics.stage("paid.parse"):
+        if pool is not None:
+            paid, main_desc, date_texts = await pool.run(_parse_paid_page, resp.text, base_url, None, now)
+        else:
+            paid, main_desc, date_texts = _parse_paid_page(resp.text, base_url, None, now)
+    metrics.incr("paid.pages_parsed")
+    if cache is not None:
+        cache.store(base_url, resp.etag, resp.last_modified, {
+            "chapters":    _chapters_to_cache(paid, date_texts),
+            "description": main_desc,
+            "digest":      digest
+        })
+    return paid, main_desc, True
+
+async def process_novel(fetcher, title: str, cache: ValidatorCache = None,
+                        store: ChapterStore = None, pool: ParsePool = None, poll: bool = True,
+                        now: datetime.datetime = None):
+    """
+    Scrape one novel and record the chapters its page lists as the
+    novel's current set in the store. Returns those chapters (fresh, or
+    from the cache on a 304), or None when the page was not polled
+    (poll=False) or could not be fetched; the store then keeps serving
+    the chapters from the last successful scrape.
+    """
+    if not poll:
+        metrics.incr("paid.novels_skipped_by_cadence")
+        return None
     try:
-        override = NOVEL_URL_OVERRIDES.get(title)
-        base    = get_novel_url(title)
-        to_try  = [base]
-
-        base_url = None
-        for url in to_try:
-            html = await fetch_page(session, url)
-            if html:
-                base_url = url
-                break
-        if not base_url:
-            print(f"❌  Could not fetch ANY page for '{title}', skipping.")
-            return []
-
-        paid_list, _ = await scrape_paid_chapters_async(session, base_url)
-        if not paid_list:
-            return []
-
-        chapters, _ = await scrape_paid_chapters_async(session, base_url)
-        items = []
-        for chap in chapters:
-            pd = chap["pubDate"]
-            if pd.tzinfo is None:
-                pd = pd.replace(tzinfo=datetime.timezone.utc)
-            if pd.minute >= 30:
-                pd += datetime.timedelta(hours=1)
-            pd = pd.replace(minute=0, second=0, microsecond=0)
-
-            items.append(MyRSSItem(
-                title=title,
-                volume=chap["volume"],
-                chaptername=chap["chaptername"],
-                nameextend=chap["nameextend"],
-                link=chap["link"],
-                description=chap["description"],
-                guid=PyRSS2Gen.Guid(chap["guid"], isPermaLink=False),
-                pubDate=pd,
-                coin=chap.get("coin","")
-            ))
-        return items
+        base_url = get_novel_url(title)
+        chapters, description, changed = await scrape_paid_chapters_async(fetcher, base_url, cache, pool, now)
+        if chapters is None:
+            metrics.incr("paid.novels_failed")
+            print(f"⚠️  Could not fetch '{title}', keeping its stored chapters.")
+            return None
+        # a 304 means the stored set is still current, unless the store is new
+        if store is not None and (changed or not store.has_novel(title)):
+            with metrics.stage("paid.store"):
+                store.record_scrape(title, chapters, description)
+        return chapters
 
     except Exception as e:
         # catch anything unexpected, log it, and keep going
         print(f"❌ Error processing {title}: {e}")
-        return []
-
-async def main_async():
-    all_items = []
-    async with aiohttp.ClientSession() as session:
-        tasks = [process_novel(session, t) for novels in TRANSLATOR_NOVEL_MAP.values() for t in novels]
-        for result in await asyncio.gather(*tasks):
-            all_items.extend(result)
-
-    # sort descending
-    all_items.sort(key=lambda it:(normalize_date(it.pubDate), chapter_num(it.chaptername)), reverse=True)
-
-    feed = CustomRSS2(
+        metrics.incr("paid.novels_errored")
+        return None
+
+def _feed_item(chap: Chapter, meta) -> Chapter:
+    """chap as it goes into the feed: pubDate rounded to the hour, meta attached."""
+    pd = chap.pubDate
+    if pd.tzinfo is None:
+        pd = pd.replace(tzinfo=datetime.timezone.utc)
+    if pd.minute >= 30:
+        pd += datetime.timedelta(hours=1)
+    pd = pd.replace(minute=0, second=0, microsecond=0)
+    return chap._replace(pubDate=pd, meta=meta)
+
+def _feed_order(item: Chapter) -> tuple:
+    return normalize_date(item.pubDate), chapter_num(item.chaptername)
+
+def _seed_store(store: ChapterStore, stored: dict):
+    """Fill an empty store from the last published feed, so nothing is lost on first use."""
+    by_novel = {}
+    for chap in stored.values():
+        by_novel.setdefault(chap.title, []).append(chap)
+    for title, chapters in by_novel.items():
+        store.record_scrape(title, chapters, chapters[0].description)
+    if by_novel:
+        print(f"🗄️  Seeded the chapter store from the published feed ({len(stored)} items).")
+
+def _write_paid_feed(xml_path: str, items) -> bool:
+    return write_feed_file(
+        xml_path,
         title="Dragonholic Paid Chapters",
         link="https://dragonholic.com",
         description="Aggregated RSS feed for paid chapters across mapped novels.",
-        lastBuildDate=datetime.datetime.now(datetime.timezone.utc),
-        items=all_items
+        last_build_date=datetime.datetime.now(datetime.timezone.utc),
+        chapters=items
     )
-    # write & prettify
-    xml_path = "dh_paid_feed.xml"
-    with open(xml_path, "w", encoding="utf-8") as f:
-        feed.writexml(f, indent="  ", addindent="  ", newl="\n")
-    pretty = xml.dom.minidom.parseString(open(xml_path, "r", encoding="utf-8").read())\
-              .toprettyxml(indent="  ")
-    with open(xml_path, "w", encoding="utf-8") as f:
-        # strip blank lines
-        f.write("\n".join(l for l in pretty.splitlines() if l.strip()))
+
+def _order_items(items, now: datetime.datetime = None) -> list:
+    """Feed order: each novel's items newest first, heap-merged, up to the feed caps."""
+    cutoff = age_cutoff(now or datetime.datetime.now(datetime.timezone.utc))
+    return newest_first(items, attrgetter("title"), _feed_order,
+                        since=cutoff, date_of=attrgetter("pubDate"))
+
+def merge_shards(shards: int, xml_path: str = PAID_FEED_PATH) -> bool:
+    """
+    Combine the item files of all shards into xml_path, in the order one
+    unsharded run would have produced, dropping chapters that have left
+    the 7-day window since their shard was written. Returns whether
+    xml_path was written.
+
+    Raises FileNotFoundError, leaving xml_path untouched, when any shard
+    file is missing: publishing without it would drop its novels from the
+    live feed.
+    """
+    if shards < 1:
+        raise ValueError(f"shard count must be at least 1, got {shards}")
+    paths = [shard_path(index, shards) for index in range(shards)]
+    missing = [path for path in paths if not os.path.exists(path)]
+    if missing:
+        metrics.incr("paid.shards_missing", len(missing))
+        raise FileNotFoundError(f"missing shard file(s): {', '.join(missing)}; "
+                                f"{xml_path} left untouched")
+
+    clock = datetime.datetime.now(datetime.timezone.utc)
+    cutoff = paid_cutoff(clock)
+    titles = [t for novels in TRANSLATOR_NOVEL_MAP.values() for t in novels]
+    order = {title: i for i, title in enumerate(titles)}
+    chapters = {}
+    with metrics.stage("paid.merge_shards"):
+        for path in paths:
+            for key, chap in load_feed_chapters(path).items():
+                chapters.setdefault(key, chap)
+        expired = sum(chap.pubDate < cutoff for chap in chapters.values())
+        metrics.incr("paid.items_expired", expired)
+        # novels in map order, as the store query returns them
+        items = sorted((chap._replace(meta=get_novel_meta(chap.title))
+                        for chap in chapters.values() if chap.pubDate >= cutoff),
+                       key=lambda chap: order.get(chap.title, len(order)))
+        all_items = _order_items(items, clock)
+    with metrics.stage("paid.serialize"):
+        written = _write_paid_feed(xml_path, all_items)
+    if not written:
+        print(f"✅  No changes; {xml_path} left untouched ({len(all_items)} items).")
+        metrics.incr("paid.writes_skipped_unchanged")
+        return False
+    metrics.incr("paid.items_written", len(all_items))
+    print(f"✅  Merged {shards} shards into {xml_path} ({len(all_items)} items).")
+    return True
+
+async def main_async(incremental: bool = False, fetcher=None, cache=None, pool=None,
+                     cadence: CadenceTracker = None, store: ChapterStore = None, shard: tuple = None):
+    """
+    Scrape every mapped novel into the chapter store, then write
+    dh_paid_feed.xml from a query over it: the chapters from each novel's
+    last successful scrape that are still inside the 7-day window. Novels
+    whose page fails to load keep their stored chapters.
+
+    With shard=(index, shards) only the novels shard_of() assigns to index
+    are scraped, and their items go to shard_path(index, shards) instead;
+    merge_shards() then builds dh_paid_feed.xml from all shard files.
+
+    The file is left untouched when only its lastBuildDate would change;
+    with incremental=True that is decided from the item set alone, before
+    sorting and serializing. Returns whether the file was written.
+
+    Pass a fetcher / cache to share the HTTP connection pool and validator
+    cache with other pipelines in the same process; otherwise this run
+    opens (and saves) its own. Likewise a long-lived ParsePool keeps its
+    worker processes between runs instead of spawning new ones, and a
+    long-lived ChapterStore keeps its connection open.
+
+    With a CadenceTracker novels are polled on their learned release
+    cadence: the rest are served from the store without a request, until
+    the next full sweep. The caller saves it.
+    """
+    if fetcher is None:
+        async with FetchScheduler() as fetcher:
+            written = await main_async(incremental, fetcher, cache, pool, cadence, store, shard)
+        fetcher.print_latency_summary()
+        return written
+    if cache is None:
+        cache = ValidatorCache()
+        written = await main_async(incremental, fetcher, cache, pool, cadence, store, shard)
+        cache.save()
+        return written
+    if pool is None:
+        pool = ParsePool()
+        try:
+            return await main_async(incremental, fetcher, cache, pool, cadence, store, shard)
+        finally:
+            pool.shutdown()
+    if store is None:
+        with ChapterStore() as store:
+            return await main_async(incremental, fetcher, cache, pool, cadence, store, shard)
+
+    titles = [t for novels in TRANSLATOR_NOVEL_MAP.values() for t in novels]
+    xml_path = PAID_FEED_PATH
+    if shard is not None:
+        titles = [t for t in titles if shard_of(t, shard[1]) == shard[0]]
+        xml_path = shard_path(*shard)
+
+    with metrics.stage("paid.load_previous"):
+        stored = load_feed_chapters(xml_path) if incremental or store.is_empty() else {}
+        if store.is_empty():
+            # a shard's own file may not exist yet; the published feed does
+            _seed_store(store, stored if xml_path == PAID_FEED_PATH else load_feed_chapters(PAID_FEED_PATH))
+    # one clock for the whole run: release dates, the 7-day window, cadence
+    clock = datetime.datetime.now(datetime.timezone.utc)
+    polled = set(titles)
+    now = clock.timestamp()
+    # with nothing stored there is nothing to fall back on: poll everything
+    sweep = cadence is None or store.is_empty() or cadence.sweep_due(now)
+    if not sweep:
+        polled = {t for t in titles if cadence.due(t, now)}
+        print(f"🧭 Polling {len(polled)}/{len(titles)} novels; "
+              f"{len(titles) - len(polled)} skipped by release cadence.")
+
+    tasks = [process_novel(fetcher, t, cache, store, pool, poll=t in polled, now=clock) for t in titles]
+    with metrics.stage("paid.scrape"):
+        results = await asyncio.gather(*tasks)
+    if cadence is not None:
+        for title, chapters in zip(titles, results):
+            if chapters is not None:
+                cadence.observe(title, [(chap.guid or chap.link, chap.pubDate) for chap in chapters], now)
+        if sweep:
+            cadence.mark_sweep(now)
+
+    items = []
+    seen = set()
+    with metrics.stage("paid.query"):
+        current = store.feed_chapters(titles, since=paid_cutoff(clock))
+    for chap in current:
+        key = item_key(chap.guid, chap.link)
+        if key in seen:
+            metrics.incr("paid.items_skipped_duplicate")
+            continue
+        seen.add(key)
+        items.append(_feed_item(chap, get_novel_meta(chap.title)))
+
+    with metrics.stage("paid.sort"):
+        all_items = _order_items(items, clock)
+    metrics.incr("paid.items_capped", len(items) - len(all_items))
+
+    unchanged = False
+    if incremental:
+        old = {chapter_fingerprint(c) for c in stored.values()}
+        unchanged = old == {chapter_fingerprint(item) for item in all_items}
+
+    if not unchanged:
+        with metrics.stage("paid.serialize"):
+            unchanged = not _write_paid_feed(xml_path, all_items)
+    if unchanged:
+        print(f"✅  No changes; {xml_path} left untouched ({len(all_items)} items).")
+        metrics.incr("paid.writes_skipped_unchanged")
+        return False
+    metrics.incr("paid.items_written", len(all_items))
         
     # ---------------------------------------------------
     # sanity‑check: make sure every mapped novel actually appeared
 
-    with open(xml_path, "r", encoding="utf-8") as f:
-        feed = feedparser.parse(f.read())
-    titles_in_feed = {entry.title for entry in feed.entries}
+    titles_in_feed = {item.title for item in items}
 
-    for translator, novels in TRANSLATOR_NOVEL_MAP.items():
-        for novel in novels:
-            if novel not in titles_in_feed:
-                print(f"❌ No feed entries for: {novel}")
+    for novel in titles:
+        if novel not in titles_in_feed:
+            print(f"❌ No feed entries for: {novel}")
+            metrics.incr("paid.novels_without_items")
     # ---------------------------------------------------
     
     print(f"✅  Feed generated with {len(all_items)} items.")
+    if shard is not None:
+        print(f"🧩 Shard {shard[0]}/{shard[1]}: {len(titles)} novels, items written to {xml_path}.")
+    return True
 
 if __name__ == "__main__":
-    asyncio.run(main_async())
+    parser = argparse.ArgumentParser(description="Generate the Dragonholic paid-chapters feed.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="decide from the published items alone whether dh_paid_feed.xml changed")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="poll each novel on its learned release cadence (implies --incremental)")
+    parser.add_argument("--shard", metavar="I/N", type=parse_shard,
+                        help="scrape only shard I of N (0-based) and write its items to "
+                             "dh_paid_feed.shard-I-of-N.xml")
+    parser.add_argument("--merge-shards", metavar="N", type=parse_shard_count,
+                        help="combine the N shard files into dh_paid_feed.xml, without scraping")
+    args = parser.parse_args()
+    if args.merge_shards is not None:
+        try:
+            written = merge_shards(args.merge_shards)
+        except FileNotFoundError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        finally:
+            metrics.write_outputs()
+        sys.exit(0 if written else EXIT_UNCHANGED)
+    cadence = CadenceTracker() if args.adaptive else None
+    try:
+        written = asyncio.run(main_async(incremental=args.incremental or args.adaptive, cadence=cadence,
+                                         shard=args.shard))
+    finally:
+        if cadence is not None:
+            cadence.save()
+        metrics.write_outputs()
+    if not written:
+        sys.exit(EXIT_UNCHANGED)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Builds dh_modified_feed.xml and dh_paid_feed.xml in one process: both
+pipelines run concurrently in one event loop and share the mapping indexes,
+the HTTP connection pool and the validator cache, so interpreter startup and
+imports are paid once per cron tick.
+"""
+import time
+_T0 = time.perf_counter()
+
+import sys
+import asyncio
+import argparse
+import traceback
+
+import dh_feed_generator
+import dh_paid_feed_generator
+from dh_http import FetchScheduler, ValidatorCache
+from dh_cadence import CadenceTracker
+from dh_metrics import metrics
+from dh_rss import EXIT_UNCHANGED
+
+_IMPORTS_DONE = time.perf_counter()
+
+# Process exit status when one pipeline failed but the other wrote its feed
+# file: the workflow still commits that file, then fails the job.
+EXIT_PARTIAL = 4
+
+
+async def _timed(name: str, timings: dict, coro):
+    t0 = time.perf_counter()
+    try:
+        return await coro
+    finally:
+        timings[name] = time.perf_counter() - t0
+
+async def run_all(incremental: bool = False, adaptive: bool = False):
+    """
+    Run the free and paid pipelines side by side. Returns (per-stage
+    timings in seconds, whether any feed file was written, {pipeline name:
+    exception} for the pipelines that failed). A failure never stops the
+    other pipeline, and the cache is saved either way. adaptive polls paid
+    novels on their learned release cadence and implies incremental.
+    """
+    timings = {"imports": _IMPORTS_DONE - _T0}
+    cache = ValidatorCache()
+    cadence = CadenceTracker() if adaptive else None
+    async with FetchScheduler() as fetcher:
+        results = await asyncio.gather(
+            _timed("free feed", timings, dh_feed_generator.main_async(fetcher, cache)),
+            _timed("paid feed", timings, dh_paid_feed_generator.main_async(incremental or adaptive, fetcher, cache,
+                                                                          cadence=cadence)),
+            return_exceptions=True,
+        )
+    # report failures before anything else can go wrong
+    errors = {}
+    for name, result in zip(("free feed", "paid feed"), results):
+        if isinstance(result, BaseException):
+            print(f"❌ {name} failed: {result!r}")
+            traceback.print_exception(type(result), result, result.__traceback__)
+            errors[name] = result
+
+    t0 = time.perf_counter()
+    cache.save()
+    if cadence is not None:
+        cadence.save()
+    timings["cache save"] = time.perf_counter() - t0
+    timings["total"] = time.perf_counter() - _T0
+
+    fetcher.print_latency_summary()
+    for name, secs in timings.items():
+        print(f"⏱️  {name:<11} {secs:7.2f}s")
+
+    written = any(r is True for r in results)
+    return timings, written, errors
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate both Dragonholic feeds in one run.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="decide from the published items alone whether dh_paid_feed.xml changed")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="poll each paid novel on its learned release cadence (implies --incremental)")
+    args = parser.parse_args(argv)
+    try:
+        _, written, errors = asyncio.run(run_all(incremental=args.incremental, adaptive=args.adaptive))
+    except Exception:
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        metrics.write_outputs()
+    if errors:
+        # the other feed's file is still worth publishing
+        sys.exit(EXIT_PARTIAL if written else 1)
+    if not written:
+        print("✅  Both feeds unchanged.")
+        sys.exit(EXIT_UNCHANGED)
+
+if __name__ == "__main__":
+    main()
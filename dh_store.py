@@ -0,0 +1,151 @@
+# dh_store.py
+#
+# Local SQLite store of every paid chapter the scrapers have seen, keyed by
+# (novel, guid, link) like dh_feed_reader.item_key. Each successful scrape of
+# a novel page replaces that novel's "current" chapter set; older rows stay
+# as history. The paid feed is then a single indexed query over the current
+# sets instead of a crawl.
+
+import os
+import sqlite3
+import datetime
+
+from dh_rss import Chapter
+
+STORE_PATH = os.environ.get("DH_STORE", ".dh_chapters.sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS novels (
+    novel       TEXT PRIMARY KEY,
+    description TEXT NOT NULL DEFAULT '',
+    scraped_at  TEXT NOT NULL            -- last successful scrape of the page
+);
+CREATE TABLE IF NOT EXISTS chapters (
+    novel       TEXT NOT NULL,
+    guid        TEXT NOT NULL,
+    volume      TEXT NOT NULL,
+    chaptername TEXT NOT NULL,
+    nameextend  TEXT NOT NULL,
+    link        TEXT NOT NULL,
+    coin        TEXT NOT NULL,
+    pubDate     TEXT NOT NULL,           -- ISO 8601, UTC, microseconds
+    first_seen  TEXT NOT NULL,
+    seen_at     TEXT NOT NULL,           -- = novels.scraped_at while on the page
+    position    INTEGER NOT NULL,        -- order on the page in that scrape
+    PRIMARY KEY (novel, guid, link)      -- guid alone can repeat across volumes
+);
+CREATE INDEX IF NOT EXISTS chapters_novel   ON chapters (novel);
+CREATE INDEX IF NOT EXISTS chapters_pubdate ON chapters (pubDate);
+"""
+# PRAGMA user_version of a store with the current layout; 0 is either new
+# or keyed on (novel, guid) only
+_SCHEMA_VERSION = 1
+
+_MIGRATE_FROM_V0 = """
+ALTER TABLE chapters RENAME TO chapters_v0;
+DROP INDEX IF EXISTS chapters_novel;
+DROP INDEX IF EXISTS chapters_pubdate;
+""" + _SCHEMA + """
+INSERT INTO chapters SELECT * FROM chapters_v0;
+DROP TABLE chapters_v0;
+"""
+
+
+def _iso(dt: datetime.datetime) -> str:
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=datetime.timezone.utc)
+    return dt.astimezone(datetime.timezone.utc).isoformat(timespec="microseconds")
+
+
+class ChapterStore:
+    """
+        with ChapterStore() as store:
+            store.record_scrape(title, chapters, description)
+            chapters = store.feed_chapters(titles, since=cutoff)
+    """
+
+    def __init__(self, path: str = STORE_PATH):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        # one writer, crash-safe without an fsync per novel
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.execute("PRAGMA synchronous = NORMAL")
+        self._migrate()
+
+    def _migrate(self):
+        version, = self.db.execute("PRAGMA user_version").fetchone()
+        if version >= _SCHEMA_VERSION:
+            return
+        exists = self.db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'chapters'").fetchone()
+        # executescript commits first; the script runs as one transaction
+        script = _MIGRATE_FROM_V0 if exists else _SCHEMA
+        self.db.executescript(f"BEGIN;\n{script}\nPRAGMA user_version = {_SCHEMA_VERSION};\nCOMMIT;")
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def is_empty(self) -> bool:
+        return self.db.execute("SELECT 1 FROM chapters LIMIT 1").fetchone() is None
+
+    def has_novel(self, novel: str) -> bool:
+        """True once a scrape of novel has been recorded."""
+        return self.db.execute("SELECT 1 FROM novels WHERE novel = ?", (novel,)).fetchone() is not None
+
+    def record_scrape(self, novel: str, chapters, description: str = None,
+                      now: datetime.datetime = None):
+        """
+        Make chapters (in page order) the novel's current set. New rows get
+        first_seen = now; known ones are updated in place. description=None
+        keeps the stored synopsis.
+        """
+        now = _iso(now or datetime.datetime.now(datetime.timezone.utc))
+        with self.db:
+            if description is None:
+                self.db.execute(
+                    "INSERT INTO novels (novel, scraped_at) VALUES (?, ?) "
+                    "ON CONFLICT (novel) DO UPDATE SET scraped_at = excluded.scraped_at",
+                    (novel, now))
+            else:
+                self.db.execute(
+                    "INSERT INTO novels (novel, description, scraped_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT (novel) DO UPDATE SET description = excluded.description, "
+                    "scraped_at = excluded.scraped_at",
+                    (novel, description, now))
+            self.db.executemany(
+                "INSERT INTO chapters (novel, guid, volume, chaptername, nameextend, link, coin, "
+                "pubDate, first_seen, seen_at, position) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (novel, guid, link) DO UPDATE SET volume = excluded.volume, "
+                "chaptername = excluded.chaptername, nameextend = excluded.nameextend, "
+                "link = excluded.link, coin = excluded.coin, pubDate = excluded.pubDate, "
+                "seen_at = excluded.seen_at, position = excluded.position",
+                [(novel, c.guid, c.volume, c.chaptername, c.nameextend, c.link, c.coin,
+                  _iso(c.pubDate), now, now, i) for i, c in enumerate(chapters)])
+
+    def known_keys(self, novel: str) -> set:
+        """item_key(guid, link) of every chapter of novel ever stored."""
+        return set(self.db.execute(
+            "SELECT guid, link FROM chapters WHERE novel = ?", (novel,)))
+
+    def feed_chapters(self, novels, since: datetime.datetime) -> list:
+        """
+        Current chapters published at or after since, for the given novels,
+        as Chapters ordered by novel (in the order given) and page position.
+        """
+        order = {novel: i for i, novel in enumerate(novels)}
+        rows = self.db.execute(
+            "SELECT c.novel, c.volume, c.chaptername, c.nameextend, c.link, n.description, "
+            "c.pubDate, c.guid, c.coin, c.position "
+            "FROM chapters c JOIN novels n ON n.novel = c.novel AND c.seen_at = n.scraped_at "
+            "WHERE c.pubDate >= ?", (_iso(since),))
+        rows = [r for r in rows if r[0] in order]
+        rows.sort(key=lambda r: (order[r[0]], r[9]))
+        return [Chapter(novel, volume, chaptername, nameextend, link, description,
+                        datetime.datetime.fromisoformat(pub), guid, coin)
+                for novel, volume, chaptername, nameextend, link, description, pub, guid, coin, _ in rows]
@@ -0,0 +1,122 @@
+# dh_text.py
+#
+# Text helpers shared by both generators: URL slugs, chapter-number sort
+# keys, volume labels from chapter URLs and the pieces of a paid chapter's
+# link text. Patterns are compiled once here, and the pure string → string
+# helpers that see the same inputs run after run are memoised in bounded
+# LRU caches.
+
+import re
+from functools import lru_cache
+from urllib.parse import urlparse, unquote
+
+# Entries per memoised helper; a run sees a few thousand distinct inputs.
+TEXT_CACHE_SIZE = 4096
+
+_SLUG_PUNCT  = re.compile(r"[^\w\s\u0080-\uFFFF-]")
+_SLUG_SPACES = re.compile(r"[\s_]+")
+_SLUG_DASHES = re.compile(r"-{2,}")
+_NUMBER      = re.compile(r"\d+(?:\.\d+)?")
+_WHITESPACE  = re.compile(r"\s+")
+# paid chapter link text: "9 - Name <i …></i> – Extension"
+_LINK_CHAPTER_NAME = re.compile(r"\s*([^<]+)")
+_LINK_NAME_EXTEND  = re.compile(r"</i>\s*[-–]\s*(.+)")
+
+_SMALL_WORDS = frozenset({"a", "an", "the", "and", "but", "or", "nor", "for", "so", "yet",
+                          "at", "by", "in", "of", "on", "to", "up", "via"})
+_COLON_KEYWORDS = frozenset({"volume", "chapter", "vol", "chap", "arc", "world", "plane", "story", "v"})
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def slug(text: str) -> str:
+    """
+    URL slug the site uses: lowercase, ASCII punctuation dropped (non-ASCII
+    such as ☆④ kept), whitespace/underscores → single hyphens.
+    """
+    s = _SLUG_PUNCT.sub("", text.lower().strip())
+    s = _SLUG_SPACES.sub("-", s)
+    return _SLUG_DASHES.sub("-", s)
+
+def chapter_num(chaptername: str) -> tuple:
+    """
+    Extracts all numeric sequences from the chaptername and returns them as a tuple.
+    Each number is converted to an int (or float if a decimal is present).
+    Any non-numeric words are ignored.
+
+    Examples:
+      "Volume 1 Chapter 15" -> (1, 15)
+      "Volume 2 Chapter 1"  -> (2, 1)
+      "Episode 2"           -> (2,)
+      "1.1"                 -> (1.1,)
+    """
+    numbers = _NUMBER.findall(chaptername)
+    if not numbers:
+        return (0,)
+    return tuple(float(n) if '.' in n else int(n) for n in numbers)
+
+def first_number(text: str) -> str:
+    """The first number in text as written ("12.5"), or "" when there is none."""
+    m = _NUMBER.search(text)
+    return m.group(0) if m else ""
+
+def collapse_whitespace(text: str) -> str:
+    return _WHITESPACE.sub(" ", text).strip()
+
+def split_chapter_link(raw_html: str):
+    """
+    (chaptername, nameextend) from the inner HTML of a paid chapter's <a>:
+    the text before the first tag, and whatever follows "</i> –" (only
+    that first dash dropped).
+    """
+    m1 = _LINK_CHAPTER_NAME.match(raw_html)
+    chap_name = m1.group(1).strip() if m1 else raw_html.strip()
+    m2 = _LINK_NAME_EXTEND.search(raw_html)
+    nameext = m2.group(1).strip() if m2 else ""
+    return chap_name, nameext
+
+def smart_title(parts: list[str]) -> str:
+    out = []
+    last = len(parts) - 1
+    for i, w in enumerate(parts):
+        wl = w.lower()
+        if i == 0 or i == last or wl not in _SMALL_WORDS:
+            out.append(w.capitalize())
+        else:
+            out.append(wl)
+    return " ".join(out)
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def format_volume_from_url(url: str) -> str:
+    """
+    Volume label from a free chapter URL (/novel/<novel>/<volume>/<chapter>/),
+    e.g. "volume-2-the-return" → "Volume 2: The Return". "" when the URL
+    has no volume segment.
+    """
+    segs = [s for s in urlparse(url).path.split("/") if s]
+    if len(segs) >= 4 and segs[0] == "novel":
+        raw   = unquote(segs[2]).replace("_","-").strip("-")
+        parts = raw.split("-")
+        if not parts:
+            return ""
+
+        lead = parts[0].lower()
+
+        if lead in _COLON_KEYWORDS and len(parts) >= 2 and parts[1].isdigit():
+            num  = parts[1]
+            rest = parts[2:]
+            # Only add colon if there's additional text after the number
+            if lead == "v":
+                if rest:
+                    return f"V{num}: {smart_title(rest)}"
+                else:
+                    return f"V{num}"
+            label = lead.capitalize()
+            if rest:
+                return f"{label} {num}: {smart_title(rest)}"
+            else:
+                return f"{label} {num}"
+
+        # fallback: smart‑title *all* parts
+        return smart_title(parts)
+
+    return ""
@@ -0,0 +1,87 @@
+# dh_title_index.py
+#
+# Substring lookup over a fixed set of novel titles, built once at import.
+
+from collections import deque
+
+
+class TitleIndex:
+    """
+    Resolves a title to the value of the *first* key (in insertion order)
+    that occurs as a substring of it – the same answer as
+
+        for key, value in pairs:
+            if key in title:
+                return value
+
+    but without looping over every key. Exact keys are answered from a
+    dict; anything else is a single Aho–Corasick pass over the title.
+    """
+
+    def __init__(self, pairs):
+        pairs = list(pairs)
+        self._values = [value for _, value in pairs]
+        # per node: outgoing edges, failure link, lowest key index ending here
+        self._goto = [{}]
+        self._fail = [0]
+        self._best = [None]
+
+        for idx, (key, _) in enumerate(pairs):
+            node = 0
+            for ch in key:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._best.append(None)
+                node = nxt
+            if self._best[node] is None:
+                self._best[node] = idx
+
+        # breadth-first: failure links + fold each suffix's best into its node
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._best[nxt] = self._min(self._best[nxt], self._best[self._fail[nxt]])
+
+        self._exact = {}
+        for key, _ in pairs:
+            if key not in self._exact:
+                self._exact[key] = self._scan(key)
+
+    @staticmethod
+    def _min(a, b):
+        if a is None:
+            return b
+        if b is None:
+            return a
+        return a if a < b else b
+
+    def _scan(self, title):
+        goto, fail, best_at = self._goto, self._fail, self._best
+        node = 0
+        best = best_at[0]
+        for ch in title:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            hit = best_at[node]
+            if hit is not None and (best is None or hit < best):
+                best = hit
+                if best == 0:
+                    break
+        return best
+
+    def lookup(self, title, default=None):
+        """Value of the first key contained in title, or default."""
+        idx = self._exact[title] if title in self._exact else self._scan(title)
+        return default if idx is None else self._values[idx]
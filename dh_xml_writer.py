@@ -0,0 +1,130 @@
+# dh_xml_writer.py
+#
+# One-pass feed serialisation. Produces the same bytes the generators used to
+# get from write → re-read → minidom.toprettyxml(indent="  ") → drop blank
+# lines, without the DOM or the extra file passes.
+
+import os
+import stat
+import tempfile
+import xml.dom.minidom
+from contextlib import contextmanager
+
+
+def _minidom_quotes_text() -> bool:
+    # Older minidom escapes '"' in text nodes as &quot;, newer releases only
+    # do so in attributes. Match whichever one this interpreter ships so the
+    # output stays identical to what toprettyxml() would have produced.
+    return xml.dom.minidom.Document().createTextNode('"').toxml() != '"'
+
+_QUOTE_TEXT = _minidom_quotes_text()
+
+
+# attributes of the <rss> root shared by both feeds
+RSS_ATTRS = [
+    ("xmlns:content", "http://purl.org/rss/1.0/modules/content/"),
+    ("xmlns:wfw", "http://wellformedweb.org/CommentAPI/"),
+    ("xmlns:dc", "http://purl.org/dc/elements/1.1/"),
+    ("xmlns:atom", "http://www.w3.org/2005/Atom"),
+    ("xmlns:sy", "http://purl.org/rss/1.0/modules/syndication/"),
+    ("xmlns:slash", "http://purl.org/rss/1.0/modules/slash/"),
+    ("xmlns:webfeeds", "http://www.webfeeds.org/rss/1.0"),
+    ("xmlns:georss", "http://www.georss.org/georss"),
+    ("xmlns:geo", "http://www.w3.org/2003/01/geo/wgs84_pos#"),
+    ("version", "2.0"),
+]
+
+
+def escape_text(data: str) -> str:
+    data = data.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    if _QUOTE_TEXT:
+        data = data.replace('"', "&quot;")
+    return data
+
+def escape_attr(data: str) -> str:
+    # the XML parser used to normalise tabs/newlines in attribute values to spaces
+    for ch in "\t\n\r":
+        data = data.replace(ch, " ")
+    return data.replace("&", "&amp;").replace("<", "&lt;")\
+               .replace(">", "&gt;").replace('"', "&quot;")
+
+def _drop_blank_lines(chunk: str) -> str:
+    return "\n".join(line for line in chunk.splitlines() if line.strip())
+
+
+class PrettyXMLWriter:
+    """
+    Streams pretty-printed XML: one element per line, two-space indent,
+    empty elements collapsed to <tag/>, no trailing newline.
+    """
+
+    def __init__(self, out, indent: str = "  "):
+        self._out = out
+        self._indent = indent
+        self._depth = 0
+        self._first = True
+
+    def _line(self, text: str):
+        text = _drop_blank_lines(text)
+        if not text:
+            return
+        if not self._first:
+            self._out.write("\n")
+        self._out.write(text)
+        self._first = False
+
+    def _open_tag(self, tag: str, attrs) -> str:
+        parts = [tag] + [f'{name}="{escape_attr(value)}"' for name, value in attrs]
+        return "<" + " ".join(parts)
+
+    def declaration(self):
+        self._line('<?xml version="1.0" ?>')
+
+    def start(self, tag: str, attrs=()):
+        self._line(self._indent * self._depth + self._open_tag(tag, attrs) + ">")
+        self._depth += 1
+
+    def end(self, tag: str):
+        self._depth -= 1
+        self._line(f"{self._indent * self._depth}</{tag}>")
+
+    def element(self, tag: str, text: str = "", attrs=(), cdata: bool = False):
+        pad = self._indent * self._depth
+        open_tag = self._open_tag(tag, attrs)
+        if not text:
+            self._line(f"{pad}{open_tag}/>")
+        elif cdata:
+            if "]]>" in text:
+                raise ValueError("']]>' not allowed in a CDATA section")
+            self._line(f"{pad}{open_tag}><![CDATA[{text}]]></{tag}>")
+        else:
+            self._line(f"{pad}{open_tag}>{escape_text(text)}</{tag}>")
+
+
+def _replacement_mode(path: str) -> int:
+    """Permission bits for a file replacing path: path's own, else what open() would give it."""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+@contextmanager
+def atomic_open(path: str, mode: str = "w"):
+    """
+    Open a temp file next to path for writing (UTF-8 text, or bytes with
+    mode="wb"); it replaces path only if the block finishes without
+    raising. The new file keeps path's permissions (mkstemp would leave
+    it 0600).
+    """
+    dirname = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=dirname, suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, encoding=None if "b" in mode else "utf-8") as f:
+            yield f
+        os.chmod(tmp, _replacement_mode(path))
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
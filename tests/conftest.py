@@ -0,0 +1,8 @@
+# The modules are flat scripts at the repo root and the stub server lives in
+# benchmarks/, as for the benchmarks themselves.
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
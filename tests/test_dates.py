@@ -0,0 +1,61 @@
+import datetime
+
+import pytest
+
+from dh_dates import DateResolver, resolver_at
+from dh_html import make_novel_soup
+from dh_paid_feed_generator import release_date_text
+from stub_server import load_novel_pages
+
+NOW = datetime.datetime(2025, 6, 1, 12, 34, 56, 789, tzinfo=datetime.timezone.utc)
+
+
+def _legacy(date_str, now=NOW):
+    """The parser DateResolver replaced, with its clock pinned to now."""
+    if date_str is None:
+        return now
+    try:
+        return datetime.datetime.strptime(date_str, "%B %d, %Y")\
+                .replace(tzinfo=datetime.timezone.utc)
+    except:
+        parts = date_str.lower().split()
+        if parts and parts[0].isdigit():
+            num = int(parts[0]); unit = parts[1]
+            if "minute" in unit: return now - datetime.timedelta(minutes=num)
+            if "hour"   in unit: return now - datetime.timedelta(hours=num)
+            if "day"    in unit: return now - datetime.timedelta(days=num)
+            if "week"   in unit: return now - datetime.timedelta(weeks=num)
+    return now
+
+def _fixture_texts() -> list:
+    texts = set()
+    for _, html, _ in load_novel_pages():
+        soup = make_novel_soup(html)
+        texts.update(release_date_text(li) for li in soup.select("li.wp-manga-chapter"))
+    return sorted(texts, key=str)
+
+EDGE_CASES = [
+    None, "", "May 2, 2025", "may 02, 2025", "MAY 2, 2025", "May  2,  2025", " May 2, 2025",
+    "May 2, 2025 ", "May 2 2025", "May 2,2025", "May 2 , 2025", "May 2, 25", "Jan 2, 2025",
+    "Sept 3, 2024", "February 29, 2024", "February 29, 2023", "February 30, 2024",
+    "September 31, 2024", "May 0, 2025", "May 2, 0000", "December 31, 9999",
+    "0 hours ago", "1 hour ago", "3 hours ago", "  4 HOURS ago", "4 hours", "4hours ago",
+    "12 mins ago", "5 minutes ago", "2 days ago", "05 days ago", "10 Days Ago", "7\tdays ago",
+    "1 week ago", "3 weeks ago", "2 months ago", "1 year ago", "5abc hours", "Yesterday", "just now",
+]
+
+def test_fixture_dates_include_both_forms():
+    texts = _fixture_texts()
+    assert any(text and text[0].isdigit() for text in texts)
+    assert any(text and text[0].isalpha() for text in texts)
+
+@pytest.mark.parametrize("text", _fixture_texts() + EDGE_CASES)
+def test_resolve_matches_the_legacy_parser(text):
+    assert DateResolver(NOW).resolve(text) == _legacy(text)
+
+def test_resolver_at_shares_one_resolver_per_clock():
+    first = resolver_at(NOW)
+    assert resolver_at(NOW) is first
+    later = NOW + datetime.timedelta(hours=1)
+    assert resolver_at(later) is not first
+    assert resolver_at(later).resolve("1 hour ago") == NOW
@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+import dh_mappings
+from dh_mappings import MappingsError, parse_mappings, load_mappings
+
+
+def _raw(**changes) -> bytes:
+    with open(dh_mappings.MAPPINGS_PATH, encoding="utf-8") as f:
+        data = json.load(f)
+    data.update(changes)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+def test_shipped_mappings_are_valid():
+    with open(dh_mappings.MAPPINGS_PATH, "rb") as f:
+        data, _ = parse_mappings(f.read())
+    assert data["translators"] == dh_mappings.TRANSLATOR_NOVEL_MAP
+
+def test_missing_comma_is_a_json_error():
+    raw = _raw().decode("utf-8").replace('"Clap",\n', '"Clap"\n', 1).encode("utf-8")
+    with pytest.raises(MappingsError, match="not valid JSON"):
+        parse_mappings(raw)
+
+def test_joined_nsfw_titles_are_not_mapped_novels():
+    # what the Python list's missing comma used to produce
+    raw = _raw(nsfw_novels=["Wicked Island Of IrelandSylvie, the Slave Girl (Lily Futa)"])
+    with pytest.raises(MappingsError, match="is not a mapped novel"):
+        parse_mappings(raw)
+
+def test_duplicate_key_is_an_error():
+    raw = _raw().decode("utf-8").replace('"translators": {', '"translators": {\n    "Kat": [],', 1)
+    with pytest.raises(MappingsError, match="'Kat' appears twice"):
+        parse_mappings(raw.encode("utf-8"))
+
+def test_every_problem_is_listed():
+    raw = _raw(nsfw_role="@&1", translators={"Kat ": ["Clap"], "alara": ["Clap"]})
+    with pytest.raises(MappingsError) as e:
+        parse_mappings(raw)
+    problems = str(e.value).splitlines()
+    assert any("surrounding whitespace" in p for p in problems)
+    assert any("listed under both" in p for p in problems)
+    assert any("not of the form" in p for p in problems)
+
+def test_sidecar_is_rebuilt_when_the_code_changes(tmp_path, monkeypatch):
+    source = tmp_path / "dh_text.py"
+    source.write_text("v1")
+    monkeypatch.setattr(dh_mappings, "_CACHE_SOURCES", (str(source),))
+    sidecar = str(tmp_path / "mappings.cache")
+
+    built = load_mappings(cache_path=sidecar)
+    assert load_mappings(cache_path=sidecar)["novel_meta"] == built["novel_meta"]
+    calls = []
+    monkeypatch.setattr(dh_mappings, "build_indexes",
+                        lambda data: calls.append(data) or built)
+    load_mappings(cache_path=sidecar)
+    assert not calls                      # same code, same data: unpickled
+    source.write_text("v2")
+    load_mappings(cache_path=sidecar)
+    assert len(calls) == 1                # code changed: rebuilt
@@ -0,0 +1,49 @@
+import asyncio
+
+import dh_paid_feed_generator as paid
+from dh_http import FetchScheduler, ValidatorCache
+from stub_server import StubServer, pointed_at
+
+ALL_TITLES = [t for novels in paid.TRANSLATOR_NOVEL_MAP.values() for t in novels]
+# a few novels served each page layout (the stub picks the layout per slug)
+_layouts, _stub = {}, StubServer()
+for _title in ALL_TITLES:
+    _layouts.setdefault(_stub.layout_of(paid.slug(_title)), []).append(_title)
+TITLES = [title for titles in _layouts.values() for title in titles[:3]]
+
+
+async def _scrape_all(cache=None):
+    async with FetchScheduler(rate=0) as fetcher:
+        return await asyncio.gather(*(paid.process_novel(fetcher, title, cache) for title in TITLES))
+
+def test_one_request_per_novel_for_both_layouts():
+    async def run():
+        async with StubServer() as stub:
+            with pointed_at(stub):
+                results = await _scrape_all()
+            return stub, results
+    stub, results = asyncio.run(run())
+
+    paths = {title: f"/novel/{paid.slug(title)}/" for title in TITLES}
+    layouts = {stub.layout_of(paid.slug(title)) for title in TITLES}
+    assert layouts == {name for name, _, _ in stub.pages}     # both page layouts served
+    assert all(chapters for chapters in results)
+    assert {paths[t]: stub.hits[paths[t]] for t in TITLES} == {p: 1 for p in paths.values()}
+    assert stub.requests == len(set(paths.values()))
+
+def test_one_conditional_request_per_novel_when_warm(tmp_path):
+    async def run():
+        cache = ValidatorCache(str(tmp_path / "cache.json"))
+        async with StubServer() as stub:
+            with pointed_at(stub):
+                cold = await _scrape_all(cache)
+                stub.hits.clear()
+                warm = await _scrape_all(cache)
+            return stub, cold, warm
+    stub, cold, warm = asyncio.run(run())
+
+    # served from the cache on 304 (relative dates re-anchored to the new run)
+    guids = lambda results: [[chap.guid for chap in chapters] for chapters in results]
+    assert guids(warm) == guids(cold)
+    assert set(stub.hits.values()) == {1}
+    assert stub.not_modified == len(stub.hits)
@@ -0,0 +1,63 @@
+import io
+import re
+import asyncio
+import contextlib
+
+import pytest
+
+import dh_paid_feed_generator as paid
+from dh_http import FetchScheduler, ValidatorCache
+from dh_store import ChapterStore
+from stub_server import StubServer, pointed_at
+
+SHARDS = 3
+# enough novels that every shard gets some, few enough to keep four runs quick
+NOVEL_MAP = {}
+for _translator, _novels in paid.TRANSLATOR_NOVEL_MAP.items():
+    if sum(map(len, NOVEL_MAP.values())) < 15:
+        NOVEL_MAP[_translator] = _novels[:3]
+
+
+def _without_build_date(path) -> str:
+    with open(path, encoding="utf-8") as f:
+        return re.sub(r"<lastBuildDate>.*?</lastBuildDate>", "", f.read())
+
+def _run(*jobs):
+    """Run paid.main_async once per job (None: unsharded, else (index, shards)) against the stub."""
+    async def run():
+        async with StubServer() as stub, FetchScheduler(rate=0) as fetcher:
+            with pointed_at(stub), contextlib.redirect_stdout(io.StringIO()):
+                for shard in jobs:
+                    name = "single" if shard is None else f"shard{shard[0]}"
+                    await paid.main_async(False, fetcher, ValidatorCache(f"{name}.json"),
+                                          store=ChapterStore(f"{name}.sqlite3"), shard=shard)
+    asyncio.run(run())
+
+@pytest.fixture(autouse=True)
+def _fewer_novels(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(paid, "TRANSLATOR_NOVEL_MAP", NOVEL_MAP)
+
+def test_merged_shards_equal_one_unsharded_run():
+    _run(None)
+    single = _without_build_date(paid.PAID_FEED_PATH)
+    _run(*((i, SHARDS) for i in range(SHARDS)))
+
+    parts = [paid.load_feed_chapters(paid.shard_path(i, SHARDS)) for i in range(SHARDS)]
+    assert all(parts)
+    assert sum(map(len, parts)) == len(paid.load_feed_chapters(paid.PAID_FEED_PATH))
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert paid.merge_shards(SHARDS, "merged.xml")
+    assert _without_build_date("merged.xml") == single
+
+def test_merge_fails_when_a_shard_is_missing():
+    _run(None, (0, SHARDS), (2, SHARDS))
+    with open(paid.PAID_FEED_PATH, "rb") as f:
+        before = f.read()
+
+    with pytest.raises(FileNotFoundError), contextlib.redirect_stdout(io.StringIO()):
+        paid.merge_shards(SHARDS)
+    with open(paid.PAID_FEED_PATH, "rb") as f:
+        assert f.read() == before
+    with pytest.raises(ValueError):
+        paid.merge_shards(0)
@@ -0,0 +1,50 @@
+import sqlite3
+import datetime
+
+from dh_rss import Chapter
+from dh_feed_reader import item_key
+from dh_store import ChapterStore
+
+NOW = datetime.datetime(2025, 6, 1, 12, tzinfo=datetime.timezone.utc)
+SINCE = NOW - datetime.timedelta(days=7)
+
+
+def _chapter(volume: str, link: str, guid: str = "1") -> Chapter:
+    # no data-chapter- class on the <li>: the guid falls back to the chapter number
+    return Chapter(volume=volume, chaptername="1 - Start", link=link,
+                   pubDate=NOW - datetime.timedelta(hours=1), guid=guid)
+
+def test_same_numbered_chapters_in_different_volumes_are_both_kept(tmp_path):
+    chapters = [_chapter("Volume 1", "https://dragonholic.com/novel/n/v1/c1/"),
+                _chapter("Volume 2", "https://dragonholic.com/novel/n/v2/c1/")]
+    with ChapterStore(str(tmp_path / "store.sqlite3")) as store:
+        store.record_scrape("N", chapters, "", now=NOW)
+        stored = store.feed_chapters(["N"], since=SINCE)
+        assert [c.link for c in stored] == [c.link for c in chapters]
+        assert store.known_keys("N") == {item_key(c.guid, c.link) for c in chapters}
+
+def test_store_keyed_on_guid_alone_is_migrated(tmp_path):
+    path = str(tmp_path / "store.sqlite3")
+    old = sqlite3.connect(path)
+    old.executescript("""
+        CREATE TABLE novels (novel TEXT PRIMARY KEY, description TEXT NOT NULL DEFAULT '',
+                             scraped_at TEXT NOT NULL);
+        CREATE TABLE chapters (novel TEXT NOT NULL, guid TEXT NOT NULL, volume TEXT NOT NULL,
+            chaptername TEXT NOT NULL, nameextend TEXT NOT NULL, link TEXT NOT NULL,
+            coin TEXT NOT NULL, pubDate TEXT NOT NULL, first_seen TEXT NOT NULL,
+            seen_at TEXT NOT NULL, position INTEGER NOT NULL, PRIMARY KEY (novel, guid));
+        CREATE INDEX chapters_novel ON chapters (novel);
+        CREATE INDEX chapters_pubdate ON chapters (pubDate);
+        INSERT INTO chapters VALUES ('N', '1', 'Volume 1', '1 - Start', '', 'https://x/v1/c1/', '',
+            '2025-06-01T11:00:00.000000+00:00', 'then', 'then', 0);
+    """)
+    old.close()
+    chapters = [_chapter("Volume 1", "https://x/v1/c1/"), _chapter("Volume 2", "https://x/v2/c1/")]
+    with ChapterStore(path) as store:
+        assert store.known_keys("N") == {("1", "https://x/v1/c1/")}     # rows carried over
+        store.record_scrape("N", chapters, "", now=NOW)
+        assert len(store.feed_chapters(["N"], since=SINCE)) == 2
+        indexes = {name for name, in store.db.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'chapters' "
+            "AND name NOT LIKE 'sqlite_%'")}
+        assert indexes == {"chapters_novel", "chapters_pubdate"}
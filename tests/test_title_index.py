@@ -0,0 +1,42 @@
+from dh_title_index import TitleIndex
+from dh_mappings import TRANSLATOR_NOVEL_MAP, FEATURED_IMAGE_MAP
+
+
+def _loop(pairs, title, default=None):
+    """What TitleIndex replaced: the first key, in order, contained in title."""
+    for key, value in pairs:
+        if key in title:
+            return value
+    return default
+
+def _titles(keys) -> list:
+    keys = list(keys)
+    titles = ["", "No such novel", keys[0][:-1]]
+    for key in keys:
+        titles += [key, f"{key} Chapter 12", f"Vol. 2 – {key}", key.lower(), key[1:]]
+    # two mapped titles in one string: the earlier-listed one must win
+    titles += [keys[-1] + " / " + keys[0], keys[1] + keys[-2]]
+    return titles
+
+def test_translator_lookup_matches_the_loop():
+    pairs = [(novel, translator) for translator, novels in TRANSLATOR_NOVEL_MAP.items() for novel in novels]
+    index = TitleIndex(pairs)
+    for title in _titles(novel for novel, _ in pairs):
+        assert index.lookup(title) == _loop(pairs, title), title
+
+def test_featured_image_lookup_matches_the_loop():
+    pairs = list(FEATURED_IMAGE_MAP.items())
+    index = TitleIndex(pairs)
+    for title in _titles(FEATURED_IMAGE_MAP):
+        assert index.lookup(title, "") == _loop(pairs, title, ""), title
+
+def test_titles_containing_other_titles():
+    pairs = [("Rebirth of the Villain", "A"), ("Rebirth", "B"), ("the Villain", "C"),
+             ("Villain", "D"), ("Rebirth of the Villain 2", "E"), ("Rebirth", "F"), ("ain", "G")]
+    index = TitleIndex(pairs)
+    titles = ["Rebirth of the Villain 2", "Rebirth of the Villain", "Rebirth", "Villain",
+              "the Villain Returns", "The Rebirth", "Rain", "Rebirt", "villain", "",
+              "Villain Rebirth", "Rebirth of the Villai"]
+    titles += [key for key, _ in pairs]
+    for title in titles:
+        assert index.lookup(title, "-") == _loop(pairs, title, "-"), title
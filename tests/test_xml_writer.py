@@ -0,0 +1,93 @@
+import io
+import os
+import stat
+import datetime
+import xml.dom.minidom
+from xml.sax.saxutils import escape
+
+import pytest
+
+from dh_mappings import NovelMeta
+from dh_rss import Chapter, write_feed
+from dh_xml_writer import PrettyXMLWriter, atomic_open
+
+
+_QUOT = {'"': "&quot;"}
+
+class _RawWriter:
+    """Same calls as PrettyXMLWriter, but compact XML for minidom to pretty-print."""
+
+    def __init__(self):
+        self.parts = []
+
+    def declaration(self):
+        self.parts.append('<?xml version="1.0"?>')
+
+    def start(self, tag, attrs=()):
+        # raw whitespace in attribute values, as the generators wrote it
+        attrs = "".join(f' {name}="{escape(value, _QUOT)}"' for name, value in attrs)
+        self.parts.append(f"<{tag}{attrs}>")
+
+    def end(self, tag):
+        self.parts.append(f"</{tag}>")
+
+    def element(self, tag, text="", attrs=(), cdata=False):
+        self.start(tag, attrs)
+        self.parts.append(f"<![CDATA[{text}]]>" if cdata else escape(text))
+        self.end(tag)
+
+def _both(write) -> tuple:
+    """(PrettyXMLWriter output, what the generators used to get from minidom) for write(xw)."""
+    buf = io.StringIO()
+    write(PrettyXMLWriter(buf))
+    raw = _RawWriter()
+    write(raw)
+    pretty = xml.dom.minidom.parseString("".join(raw.parts)).toprettyxml(indent="  ")
+    return buf.getvalue(), "\n".join(line for line in pretty.splitlines() if line.strip())
+
+TEXTS = ["", " ", " \n\t ", 'say "hi" & \'bye\' <b>', "line 1\nline 2\n\n  line 3", "\n padded \n"]
+
+@pytest.mark.parametrize("cdata", [False, True])
+@pytest.mark.parametrize("text", TEXTS)
+def test_element_matches_minidom(text, cdata):
+    def write(xw):
+        xw.declaration()
+        xw.start("rss", [("version", "2.0")])
+        xw.element("description", text, attrs=[("note", 'a "b"\tc')], cdata=cdata)
+        xw.end("rss")
+    ours, theirs = _both(write)
+    assert ours == theirs
+
+def test_feed_matches_minidom():
+    meta = NovelMeta("Someone", "<@&1> <@&2>", "NSFW", "https://example.com/a.jpg")
+    when = datetime.datetime(2025, 5, 2, 8, tzinfo=datetime.timezone.utc)
+    chapters = [Chapter(title=f"Novel {i}", volume=" ", chaptername=f'Chapter {i} – "quoted"',
+                        nameextend=text, link=f"https://example.com/n/{i}/", description=text,
+                        pubDate=when, guid=str(i), coin="5" if i % 2 else "", meta=meta)
+                for i, text in enumerate(TEXTS)]
+    ours, theirs = _both(lambda xw: write_feed(xw, "Feed", "https://example.com/", "Multi\nline",
+                                               when, chapters))
+    assert ours == theirs
+
+
+def _mode(path) -> int:
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+def test_atomic_open_keeps_the_replaced_files_mode(tmp_path):
+    path = tmp_path / "feed.xml"
+    path.write_text("old")
+    os.chmod(path, 0o644)
+    with atomic_open(str(path)) as f:
+        f.write("new")
+    assert path.read_text() == "new"
+    assert _mode(path) == 0o644
+
+def test_atomic_open_gives_a_new_file_the_umask_mode(tmp_path):
+    path = tmp_path / "feed.xml"
+    umask = os.umask(0o022)
+    try:
+        with atomic_open(str(path)) as f:
+            f.write("new")
+    finally:
+        os.umask(umask)
+    assert _mode(path) == 0o644